@@ -1,15 +1,22 @@
 from flask import Flask, render_template, request, jsonify
+from flask.json.provider import DefaultJSONProvider
 import os
 import uuid
-import json
 import logging
 from werkzeug.utils import secure_filename
 from concurrent.futures import ThreadPoolExecutor, TimeoutError
-from sentence_transformers import SentenceTransformer
-from utils.resume_parser import parse_resume, COMMON_SKILLS
+from utils.resume_parser import parse_resume, COMMON_SKILLS, SKILLS_VERSION
 from utils.nlp_processor import preprocess_text, extract_skills
-from utils.matching import match_resume_to_job
+from utils.matching import match_resume_to_job, rank_resumes_for_job, get_text_embedding, hybrid_search_scores, model, MODEL_VERSION
+from utils.skill_index import SkillIndex
+from utils.search_index import BM25Index
+from utils.vector_store import QuantizedVectorStore
+from utils.reindex import ReindexJob
+from utils.resume_sync import ResumeSync
+from utils import serialization
+from utils.serialization import dumps, loads
 import boto3
+from botocore.config import Config
 from botocore.exceptions import NoCredentialsError, ClientError
 from io import BytesIO
 import tempfile
@@ -20,14 +27,34 @@ app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max upload
 app.config['ALLOWED_EXTENSIONS'] = {'txt', 'pdf', 'docx'}
 
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson"""
+
+    def dumps(self, obj, **kwargs):
+        return dumps(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return loads(s)
+
+if serialization.orjson is not None:
+    app.json = FastJSONProvider(app)
+
+# Large text/vector fields left out of read responses unless requested via ?fields=
+RESUME_HEAVY_FIELDS = ('raw_text', 'clean_text', 'processed_text', 'embedding')
+JOB_HEAVY_FIELDS = ('processed_text',)
+
 # AWS S3 Configuration (credentials via environment variables or IAM roles)
 AWS_REGION = os.getenv('AWS_REGION', 'us-east-1')
 S3_BUCKET = os.getenv('S3_BUCKET', 'resuucketaw')
 
+# Max concurrent S3 calls per process (async mode), independent of CPU workers
+IO_CONCURRENCY = int(os.getenv('IO_CONCURRENCY', 32))
+
 # Initialize S3 client
 s3_client = boto3.client(
     's3',
-    region_name=AWS_REGION
+    region_name=AWS_REGION,
+    config=Config(max_pool_connections=IO_CONCURRENCY)
 )  # Credentials are handled by AWS SDK (IAM roles or env vars)
 
 # Create necessary directories for local development
@@ -38,12 +65,45 @@ os.makedirs('data/job_descriptions', exist_ok=True)
 resumes = {}
 jobs = {}
 
-# Load the SentenceTransformer model once
-model = SentenceTransformer('paraphrase-MiniLM-L6-v2')
+# Inverted skill index over resumes (kept in sync on create/delete)
+skill_index = SkillIndex(COMMON_SKILLS)
+
+# BM25 keyword index over processed resume text, persisted to local disk
+search_index = BM25Index(os.getenv('SEARCH_INDEX_PATH', 'data/search_index.npz'))
+
+# Default number of top candidates re-scored exactly in float32 (0 disables).
+# Only quantized vectors are kept, so each rescored candidate is re-encoded:
+# N adds N model passes to every rank/hybrid search request.
+EXACT_RESCORE_TOP = int(os.getenv('EXACT_RESCORE_TOP', 0))
+
+# Resume embeddings held as int8 (or float16) instead of float32 lists on each record,
+# sized from the shared encoder so swapping models (see MODEL_VERSION) needs no code change
+vector_store = QuantizedVectorStore(model.get_sentence_embedding_dimension(), os.getenv('EMBEDDING_DTYPE', 'int8'))
 
 # ThreadPoolExecutor for asynchronous processing
 executor = ThreadPoolExecutor(max_workers=int(os.getenv('WORKERS', 4)))
 
+# Background job refreshing stored records after COMMON_SKILLS or model changes
+reindex_job = ReindexJob(
+    s3_client,
+    S3_BUCKET,
+    batch_size=int(os.getenv('REINDEX_BATCH_SIZE', 32)),
+    workers=int(os.getenv('WORKERS', 4)),
+    on_update=lambda s3_key, record: apply_reindexed_record(s3_key, record),
+    poll_interval=float(os.getenv('REINDEX_POLL_SECONDS', 10))
+)
+
+# Each worker holds its own resumes; follow uploads/deletes made through the others
+resume_sync = ResumeSync(
+    s3_client,
+    S3_BUCKET,
+    local_ids=lambda: list(resumes),
+    on_add=lambda resume_id, resume: cache_resume(resume_id, resume),
+    on_remove=lambda resume_id: drop_resume(resume_id),
+    interval=float(os.getenv('RESUME_SYNC_SECONDS', 30)),
+    workers=IO_CONCURRENCY
+)
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -86,6 +146,179 @@ def delete_from_s3(object_name, bucket=S3_BUCKET):
         logger.error(f"S3 delete error: {e}")
         return False
 
+def store_embedding(resume_id, resume_data):
+    """Move a resume's float32 embedding off the record into the vector store"""
+    embedding = resume_data.pop('embedding', None)
+    if embedding is not None and resume_data.get('model_version') == MODEL_VERSION:
+        vector_store.add(resume_id, embedding)
+
+def index_resume(resume_id, resume_data):
+    """Add a resume to the in-memory skill, keyword and vector indexes"""
+    skill_index.add(resume_id, resume_data.get('skills', []))
+    search_index.add(resume_id, resume_data.get('processed_text', ''))
+    store_embedding(resume_id, resume_data)
+
+def unindex_resume(resume_id):
+    """Drop a resume from the in-memory skill, keyword and vector indexes"""
+    skill_index.remove(resume_id)
+    search_index.remove(resume_id)
+    vector_store.remove(resume_id)
+
+def cache_resume(resume_id, resume_data):
+    """Keep a resume in memory and add it to the indexes"""
+    resumes[resume_id] = resume_data
+    index_resume(resume_id, resume_data)
+
+def drop_resume(resume_id):
+    """Forget a resume held in memory and drop it from the indexes"""
+    resumes.pop(resume_id, None)
+    unindex_resume(resume_id)
+
+def build_job(job_id, title, description):
+    """Build a job record with its processed text and extracted skills"""
+    return {
+        'id': job_id,
+        'title': title,
+        'description': description,
+        'processed_text': preprocess_text(description),
+        'skills': extract_skills(description, COMMON_SKILLS),
+        'skills_version': SKILLS_VERSION
+    }
+
+def search_resume_hits(query, limit, alpha, rescore, hybrid, required_skills):
+    """BM25 keyword search, optionally reranked with embeddings (CPU-bound)"""
+    # Lemmatize the query the same way resume text was processed
+    processed_query = preprocess_text(query)
+    candidates = skill_index.filter(required_skills) if required_skills else None
+
+    # Fetch extra lexical hits in hybrid mode so reranking has room to reorder
+    hits = search_index.search(processed_query.split(), limit=limit * 5 if hybrid else limit,
+                               candidates=candidates)
+    hits = [(resume_id, score) for resume_id, score in hits if resume_id in resumes]
+
+    if hybrid:
+        return hybrid_search_scores(processed_query, [resumes[resume_id] for resume_id, _ in hits],
+                                    dict(hits), vector_store, alpha, rescore)[:limit]
+    return [{'id': resume_id, 'name': resumes[resume_id].get('name'), 'score': score}
+            for resume_id, score in hits]
+
+def rank_job_candidates(job_data, required_skills, rescore):
+    """Rank in-memory resumes against a job, prefiltered on must-have skills (CPU-bound)"""
+    # Prefilter candidates on must-have skills, then score skills as one mat-vec
+    if required_skills:
+        candidate_ids = skill_index.filter(required_skills, candidates=resumes)
+        skill_scores = skill_index.skill_scores(job_data.get('skills', []), candidate_ids)
+    else:
+        candidate_ids = list(resumes)
+        skill_scores = skill_index.skill_scores(job_data.get('skills', []))
+    candidates = [resumes[resume_id] for resume_id in candidate_ids if resume_id in resumes]
+    return rank_resumes_for_job(candidates, job_data, skill_scores, vector_store, rescore)
+
+def list_resumes(resume_ids, required_skills, fields):
+    """Project listed resumes, keeping only those with all must-have skills"""
+    if required_skills:
+        matching_ids = skill_index.filter(required_skills)
+        resume_ids = [resume_id for resume_id in resume_ids if resume_id in matching_ids]
+    return [select_resume_fields(resume_id, resumes[resume_id], fields)
+            for resume_id in resume_ids if resume_id in resumes]
+
+def select_resume_fields(resume_id, resume, fields):
+    """select_fields for resumes, restoring a requested embedding from the vector store.
+
+    Stored embeddings live only in the vector store, so the returned vector
+    is the dequantized, unit-length approximation.
+    """
+    selected = select_fields(resume, fields, RESUME_HEAVY_FIELDS)
+    if 'embedding' in fields:
+        try:
+            selected['embedding'] = vector_store.get(resume_id).tolist()
+        except KeyError:
+            pass
+    return selected
+
+def apply_reindexed_record(s3_key, record):
+    """Replace the in-memory copy of a record rewritten by the re-index job"""
+    if 'id' not in record:
+        return
+    if s3_key.startswith('jobs/'):
+        jobs[record['id']] = record
+        return
+    resume_id = record['id']
+    previous = resumes.get(resume_id, {})
+    resumes[resume_id] = record
+    # A re-index rewrites skills and embeddings; keyword postings (and their
+    # journal entries) only need touching if the text itself changed
+    skill_index.add(resume_id, record.get('skills', []))
+    if record.get('processed_text') != previous.get('processed_text'):
+        search_index.add(resume_id, record.get('processed_text', ''))
+    store_embedding(resume_id, record)
+
+def parse_skill_filter(skills):
+    """Split a comma-separated must-have skills string, rejecting skills outside COMMON_SKILLS"""
+    required = [skill.strip().lower() for skill in skills.split(',') if skill.strip()]
+    # The vocabulary is closed, so an unknown skill is a typo rather than "nobody qualifies"
+    unknown = skill_index.unknown(required)
+    if unknown:
+        raise ValueError(f"Unknown skills: {', '.join(unknown)}")
+    return required
+
+def get_skill_filter():
+    """Parse the comma-separated ?skills= must-have filter"""
+    return parse_skill_filter(request.args.get('skills', ''))
+
+def parse_search_params(args):
+    """Parse limit/alpha/rescore/hybrid for keyword search; raises ValueError with the client error"""
+    try:
+        limit = int(args.get('limit', 10))
+        alpha = float(args.get('alpha', 0.5))
+        rescore = int(args.get('rescore', EXACT_RESCORE_TOP))
+    except ValueError:
+        raise ValueError('limit, alpha and rescore must be numbers')
+    if limit < 1:
+        raise ValueError('limit must be at least 1')
+    if alpha != alpha:
+        raise ValueError('alpha must be a number between 0 and 1')
+    hybrid = args.get('hybrid', 'false').lower() in ('1', 'true', 'yes')
+    return limit, min(max(alpha, 0.0), 1.0), rescore, hybrid
+
+def parse_rank_params(args):
+    """Parse limit/rescore for ranking; raises ValueError with the client error"""
+    try:
+        limit = int(args.get('limit', 20))
+        rescore = int(args.get('rescore', EXACT_RESCORE_TOP))
+    except ValueError:
+        raise ValueError('limit and rescore must be integers')
+    if limit < 1:
+        raise ValueError('limit must be at least 1')
+    return limit, rescore
+
+def parse_fields(fields):
+    """Split a comma-separated field selection string"""
+    return [field.strip() for field in fields.split(',') if field.strip()]
+
+def select_fields(record, fields, exclude=()):
+    """Project a record onto the requested fields, or drop excluded ones by default"""
+    if fields:
+        return {field: record[field] for field in fields if field in record}
+    return {key: value for key, value in record.items() if key not in exclude}
+
+@app.after_request
+def compress_response(response):
+    """Compress JSON/HTML bodies with gzip or brotli per Accept-Encoding"""
+    if (response.direct_passthrough or response.status_code != 200
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in ('application/json', 'text/html')):
+        return response
+    body = response.get_data()
+    if len(body) < serialization.MIN_COMPRESS_SIZE:
+        return response
+    response.vary.add('Accept-Encoding')
+    encoding = serialization.negotiate_encoding(request.headers.get('Accept-Encoding', ''))
+    if encoding:
+        response.set_data(serialization.compress(body, encoding))
+        response.headers['Content-Encoding'] = encoding
+    return response
+
 @app.route('/')
 def index():
     return render_template('index.html')
@@ -134,14 +367,18 @@ def process_resume():
         resume_data['id'] = resume_id
         resume_data['name'] = filename
         resume_data['s3_key'] = s3_object_name
-        resumes[resume_id] = resume_data
+        resume_data['embedding'] = get_text_embedding(resume_data['processed_text']).tolist()
+        resume_data['model_version'] = MODEL_VERSION
 
-        # Save resume metadata to S3
-        resume_json = json.dumps(resume_data).encode('utf-8')
+        # Save resume metadata to S3 (with its embedding, before indexing moves it)
+        resume_json = dumps(resume_data)
         metadata_s3_key = f"resumes/{resume_id}.json"
         if not upload_to_s3(BytesIO(resume_json), metadata_s3_key):
             logger.warning(f"Failed to save resume metadata to s3://{S3_BUCKET}/{metadata_s3_key}")
 
+        resumes[resume_id] = resume_data
+        index_resume(resume_id, resume_data)
+
         return jsonify({
             'id': resume_id,
             'name': filename,
@@ -171,20 +408,11 @@ def process_job():
             return jsonify({'error': 'Job description is required'}), 400
 
         job_id = str(uuid.uuid4())
-        clean_description = preprocess_text(job_description)
-        skills = extract_skills(job_description, COMMON_SKILLS)
-
-        job_data = {
-            'id': job_id,
-            'title': job_title,
-            'description': job_description,
-            'processed_text': clean_description,
-            'skills': skills
-        }
+        job_data = build_job(job_id, job_title, job_description)
         jobs[job_id] = job_data
 
         # Save to S3
-        job_json = json.dumps(job_data).encode('utf-8')
+        job_json = dumps(job_data)
         s3_key = f"jobs/{job_id}.json"
         if not upload_to_s3(BytesIO(job_json), s3_key):
             logger.warning(f"Failed to save job to s3://{S3_BUCKET}/{s3_key}")
@@ -192,7 +420,7 @@ def process_job():
         return jsonify({
             'id': job_id,
             'title': job_title,
-            'skills': skills
+            'skills': job_data['skills']
         })
     except Exception as e:
         logger.error(f"Error processing job: {str(e)}")
@@ -217,7 +445,8 @@ def match():
             try:
                 s3_key = f"resumes/{resume_id}.json"
                 response = s3_client.get_object(Bucket=S3_BUCKET, Key=s3_key)
-                resumes[resume_id] = json.loads(response['Body'].read().decode('utf-8'))
+                resumes[resume_id] = loads(response['Body'].read())
+                index_resume(resume_id, resumes[resume_id])
             except ClientError:
                 return jsonify({'error': 'Resume not found'}), 404
 
@@ -226,7 +455,7 @@ def match():
             try:
                 s3_key = f"jobs/{job_id}.json"
                 response = s3_client.get_object(Bucket=S3_BUCKET, Key=s3_key)
-                jobs[job_id] = json.loads(response['Body'].read().decode('utf-8'))
+                jobs[job_id] = loads(response['Body'].read())
             except ClientError:
                 return jsonify({'error': 'Job not found'}), 404
 
@@ -249,38 +478,76 @@ def match():
 @app.route('/api/resumes', methods=['GET'])
 def get_resumes():
     try:
-        # List resumes from S3
+        try:
+            required_skills = get_skill_filter()
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        fields = parse_fields(request.args.get('fields', 'id,name'))
+
+        # List resumes from S3, fetching only those not already in memory
         response = s3_client.list_objects_v2(Bucket=S3_BUCKET, Prefix='resumes/')
-        resume_list = []
+        resume_ids = []
         if 'Contents' in response:
             for obj in response['Contents']:
                 if obj['Key'].endswith('.json'):
-                    try:
-                        resume_data = s3_client.get_object(Bucket=S3_BUCKET, Key=obj['Key'])
-                        resume = json.loads(resume_data['Body'].read().decode('utf-8'))
-                        resume_list.append({'id': resume['id'], 'name': resume['name']})
-                    except Exception as e:
-                        logger.error(f"Error loading resume {obj['Key']}: {str(e)}")
-        return jsonify({'resumes': resume_list})
+                    resume_id = obj['Key'][len('resumes/'):-len('.json')]
+                    if resume_id not in resumes:
+                        try:
+                            resume_data = s3_client.get_object(Bucket=S3_BUCKET, Key=obj['Key'])
+                            cache_resume(resume_id, loads(resume_data['Body'].read()))
+                        except Exception as e:
+                            logger.error(f"Error loading resume {obj['Key']}: {str(e)}")
+                            continue
+                    resume_ids.append(resume_id)
+
+        return jsonify({'resumes': list_resumes(resume_ids, required_skills, fields)})
     except Exception as e:
         logger.error(f"Error getting resumes: {str(e)}")
         return jsonify({'error': f'Error retrieving resumes: {str(e)}'}), 500
 
+@app.route('/api/resumes/search', methods=['GET'])
+def search_resumes():
+    try:
+        query = request.args.get('q', '').strip()
+        if not query:
+            return jsonify({'error': 'Search query is required'}), 400
+
+        try:
+            limit, alpha, rescore, hybrid = parse_search_params(request.args)
+            required_skills = get_skill_filter()
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        fields = parse_fields(request.args.get('fields', ''))
+
+        results = search_resume_hits(query, limit, alpha, rescore, hybrid, required_skills)
+        results = [select_fields(row, fields) for row in results]
+
+        return jsonify({'query': query, 'results': results})
+    except Exception as e:
+        logger.error(f"Error searching resumes: {str(e)}")
+        return jsonify({'error': f'Error searching resumes: {str(e)}'}), 500
+
 @app.route('/api/jobs', methods=['GET'])
 def get_jobs():
     try:
-        # List jobs from S3
+        fields = parse_fields(request.args.get('fields', 'id,title'))
+
+        # List jobs from S3, fetching only those not already in memory
         response = s3_client.list_objects_v2(Bucket=S3_BUCKET, Prefix='jobs/')
         job_list = []
         if 'Contents' in response:
             for obj in response['Contents']:
                 if obj['Key'].endswith('.json'):
-                    try:
-                        job_data = s3_client.get_object(Bucket=S3_BUCKET, Key=obj['Key'])
-                        job = json.loads(job_data['Body'].read().decode('utf-8'))
-                        job_list.append({'id': job['id'], 'title': job['title']})
-                    except Exception as e:
-                        logger.error(f"Error loading job {obj['Key']}: {str(e)}")
+                    job_id = obj['Key'][len('jobs/'):-len('.json')]
+                    if job_id not in jobs:
+                        try:
+                            job_data = s3_client.get_object(Bucket=S3_BUCKET, Key=obj['Key'])
+                            jobs[job_id] = loads(job_data['Body'].read())
+                        except Exception as e:
+                            logger.error(f"Error loading job {obj['Key']}: {str(e)}")
+                            continue
+                    job_list.append(select_fields(jobs[job_id], fields, JOB_HEAVY_FIELDS))
         return jsonify({'jobs': job_list})
     except Exception as e:
         logger.error(f"Error getting jobs: {str(e)}")
@@ -293,12 +560,13 @@ def job_operations(job_id):
             try:
                 s3_key = f"jobs/{job_id}.json"
                 response = s3_client.get_object(Bucket=S3_BUCKET, Key=s3_key)
-                jobs[job_id] = json.loads(response['Body'].read().decode('utf-8'))
+                jobs[job_id] = loads(response['Body'].read())
             except ClientError:
                 return jsonify({'error': 'Job not found'}), 404
 
         if request.method == 'GET':
-            return jsonify({'job': jobs[job_id]})
+            fields = parse_fields(request.args.get('fields', ''))
+            return jsonify({'job': select_fields(jobs[job_id], fields, JOB_HEAVY_FIELDS)})
 
         elif request.method == 'DELETE':
             s3_key = f"jobs/{job_id}.json"
@@ -309,27 +577,70 @@ def job_operations(job_id):
         logger.error(f"Error in job operations: {str(e)}")
         return jsonify({'error': f'Error with job operation: {str(e)}'}), 500
 
-@app.route('/api/resumes/<resume_id>', methods=['DELETE'])
-def delete_resume(resume_id):
+@app.route('/api/jobs/<job_id>/rank', methods=['GET'])
+def rank_resumes(job_id):
+    try:
+        if job_id not in jobs:
+            try:
+                s3_key = f"jobs/{job_id}.json"
+                response = s3_client.get_object(Bucket=S3_BUCKET, Key=s3_key)
+                jobs[job_id] = loads(response['Body'].read())
+            except ClientError:
+                return jsonify({'error': 'Job not found'}), 404
+
+        try:
+            limit, rescore = parse_rank_params(request.args)
+            required_skills = get_skill_filter()
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        future = executor.submit(rank_job_candidates, jobs[job_id], required_skills, rescore)
+        try:
+            ranking = future.result(timeout=60)
+        except TimeoutError:
+            logger.error("Ranking calculation timed out")
+            return jsonify({'error': 'Ranking calculation timed out'}), 500
+
+        fields = parse_fields(request.args.get('fields', ''))
+        return jsonify({'job_id': job_id, 'results': [select_fields(row, fields) for row in ranking[:limit]]})
+    except Exception as e:
+        logger.error(f"Error ranking resumes: {str(e)}")
+        return jsonify({'error': f'Error ranking resumes: {str(e)}'}), 500
+
+@app.route('/api/resumes/<resume_id>', methods=['GET', 'DELETE'])
+def resume_operations(resume_id):
     try:
         if resume_id not in resumes:
             try:
                 s3_key = f"resumes/{resume_id}.json"
                 response = s3_client.get_object(Bucket=S3_BUCKET, Key=s3_key)
-                resumes[resume_id] = json.loads(response['Body'].read().decode('utf-8'))
+                resumes[resume_id] = loads(response['Body'].read())
+                index_resume(resume_id, resumes[resume_id])
             except ClientError:
                 return jsonify({'error': 'Resume not found'}), 404
 
+        if request.method == 'GET':
+            fields = parse_fields(request.args.get('fields', ''))
+            return jsonify({'resume': select_resume_fields(resume_id, resumes[resume_id], fields)})
+
         s3_key = resumes[resume_id].get('s3_key')
         metadata_s3_key = f"resumes/{resume_id}.json"
         if s3_key:
             delete_from_s3(s3_key)
         delete_from_s3(metadata_s3_key)
-        del resumes[resume_id]
+        drop_resume(resume_id)
         return jsonify({'success': True})
     except Exception as e:
-        logger.error(f"Error deleting resume: {str(e)}")
-        return jsonify({'error': f'Error deleting resume: {str(e)}'}), 500
+        logger.error(f"Error in resume operations: {str(e)}")
+        return jsonify({'error': f'Error with resume operation: {str(e)}'}), 500
+
+@app.route('/api/reindex', methods=['GET', 'POST'])
+def reindex():
+    if request.method == 'POST':
+        if not reindex_job.start():
+            return jsonify({'error': 'Re-index already running', 'status': reindex_job.status}), 409
+        return jsonify({'status': reindex_job.status}), 202
+    return jsonify({'status': reindex_job.status})
 
 @app.errorhandler(413)
 def request_entity_too_large(error):
@@ -345,7 +656,7 @@ def load_saved_data_from_s3():
                 if obj['Key'].endswith('.json'):
                     try:
                         job_data = s3_client.get_object(Bucket=S3_BUCKET, Key=obj['Key'])
-                        job = json.loads(job_data['Body'].read().decode('utf-8'))
+                        job = loads(job_data['Body'].read())
                         if 'id' in job:
                             jobs[job['id']] = job
                     except Exception as e:
@@ -358,9 +669,11 @@ def load_saved_data_from_s3():
                 if obj['Key'].endswith('.json'):
                     try:
                         resume_data = s3_client.get_object(Bucket=S3_BUCKET, Key=obj['Key'])
-                        resume = json.loads(resume_data['Body'].read().decode('utf-8'))
+                        resume = loads(resume_data['Body'].read())
                         if 'id' in resume:
                             resumes[resume['id']] = resume
+                            skill_index.add(resume['id'], resume.get('skills', []))
+                            store_embedding(resume['id'], resume)
                     except Exception as e:
                         logger.error(f"Error loading resume {obj['Key']}: {str(e)}")
     except Exception as e:
@@ -368,6 +681,11 @@ def load_saved_data_from_s3():
 
 # Initialize data on startup
 load_saved_data_from_s3()
+search_index.load()
+search_index.sync({resume_id: resume.get('processed_text', '') for resume_id, resume in resumes.items()})
+# Pick up records re-indexed by whichever worker runs the job
+reindex_job.start_watcher()
+resume_sync.start()
 
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=int(os.getenv('PORT', 5000)))
\ No newline at end of file
@@ -0,0 +1,404 @@
+import os
+import uuid
+import asyncio
+import tempfile
+import functools
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+from a2wsgi import WSGIMiddleware
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse as StarletteJSONResponse
+from starlette.middleware import Middleware
+from starlette.routing import Route, Mount
+from werkzeug.utils import secure_filename
+from botocore.exceptions import ClientError
+import app as wsgi
+from utils.resume_parser import parse_resume
+from utils.matching import match_resume_to_job, get_text_embedding, MODEL_VERSION
+from utils import serialization
+from utils.serialization import dumps, loads
+
+# Async serving mode: S3 calls are awaited on a dedicated I/O pool sized by
+# IO_CONCURRENCY, while parsing/encoding stays on the bounded CPU executor
+# (WORKERS). Only the index page falls through to the Flask app, on an
+# a2wsgi pool also sized by IO_CONCURRENCY.
+io_executor = ThreadPoolExecutor(max_workers=wsgi.IO_CONCURRENCY)
+logger = wsgi.logger
+
+class JSONResponse(StarletteJSONResponse):
+    """JSON response rendered with the fast serializer"""
+
+    def render(self, content):
+        return dumps(content)
+
+class CompressionMiddleware:
+    """Compress JSON/HTML responses with gzip or brotli per Accept-Encoding"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope['method'] == 'HEAD':
+            return await self.app(scope, receive, send)
+
+        request_headers = dict(scope['headers'])
+        encoding = serialization.negotiate_encoding(
+            request_headers.get(b'accept-encoding', b'').decode('latin-1'))
+        start_message = None
+        body = []
+
+        async def send_wrapper(message):
+            nonlocal start_message
+            if message['type'] == 'http.response.start':
+                headers = dict(message['headers'])
+                content_type = headers.get(b'content-type', b'').split(b';')[0]
+                # Pass through anything not eligible, e.g. Flask-compressed or static files
+                if (message['status'] != 200 or b'content-encoding' in headers
+                        or content_type not in (b'application/json', b'text/html')):
+                    await send(message)
+                else:
+                    start_message = message
+                return
+            if start_message is None:
+                await send(message)
+                return
+
+            body.append(message.get('body', b''))
+            if message.get('more_body', False):
+                return
+            data = b''.join(body)
+            headers = [(name, value) for name, value in start_message['headers']
+                       if name not in (b'content-length', b'vary')]
+            # Keep any Vary values set by the app (e.g. Cookie) alongside Accept-Encoding
+            vary = [value.strip() for name, header in start_message['headers'] if name == b'vary'
+                    for value in header.split(b',') if value.strip()]
+            if b'accept-encoding' not in {value.lower() for value in vary}:
+                vary.append(b'Accept-Encoding')
+            headers.append((b'vary', b', '.join(vary)))
+            if encoding and len(data) >= serialization.MIN_COMPRESS_SIZE:
+                data = serialization.compress(data, encoding)
+                headers.append((b'content-encoding', encoding.encode('latin-1')))
+            headers.append((b'content-length', str(len(data)).encode('latin-1')))
+            await send({**start_message, 'headers': headers})
+            await send({'type': 'http.response.body', 'body': data})
+
+        await self.app(scope, receive, send_wrapper)
+
+async def run_io(func, *args, **kwargs):
+    """Run a blocking storage call on the I/O pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(io_executor, functools.partial(func, *args, **kwargs))
+
+async def run_cpu(func, *args, timeout=None):
+    """Run CPU-bound work on the shared CPU executor"""
+    loop = asyncio.get_running_loop()
+    return await asyncio.wait_for(loop.run_in_executor(wsgi.executor, func, *args), timeout)
+
+def get_json_from_s3(s3_key):
+    """Fetch and decode a JSON record, or None if it does not exist"""
+    try:
+        response = wsgi.s3_client.get_object(Bucket=wsgi.S3_BUCKET, Key=s3_key)
+        return loads(response['Body'].read())
+    except ClientError:
+        return None
+
+async def load_resume(resume_id):
+    if resume_id not in wsgi.resumes:
+        resume = await run_io(get_json_from_s3, f"resumes/{resume_id}.json")
+        if resume is None:
+            return None
+        # Index maintenance appends to the search journal; keep it off the event loop
+        await run_cpu(wsgi.cache_resume, resume_id, resume)
+    return wsgi.resumes.get(resume_id)
+
+async def load_job(job_id):
+    if job_id not in wsgi.jobs:
+        job = await run_io(get_json_from_s3, f"jobs/{job_id}.json")
+        if job is None:
+            return None
+        wsgi.jobs[job_id] = job
+    return wsgi.jobs[job_id]
+
+async def list_record_ids(prefix):
+    """List record ids under a prefix from their .json keys"""
+    response = await run_io(wsgi.s3_client.list_objects_v2, Bucket=wsgi.S3_BUCKET, Prefix=prefix)
+    return [obj['Key'][len(prefix):-len('.json')] for obj in response.get('Contents', [])
+            if obj['Key'].endswith('.json')]
+
+def parse_and_embed(temp_path):
+    """Parse a resume file and attach its embedding"""
+    resume_data = parse_resume(temp_path)
+    if resume_data:
+        resume_data['embedding'] = get_text_embedding(resume_data['processed_text']).tolist()
+        resume_data['model_version'] = MODEL_VERSION
+    return resume_data
+
+async def process_resume(request):
+    if int(request.headers.get('content-length', 0)) > wsgi.app.config['MAX_CONTENT_LENGTH']:
+        return JSONResponse({'error': 'File too large. Maximum size is 16MB'}, 413)
+
+    form = await request.form()
+    file = form.get('resume')
+    if file is None or isinstance(file, str):
+        return JSONResponse({'error': 'No file part'}, 400)
+    if file.filename == '':
+        return JSONResponse({'error': 'No selected file'}, 400)
+    if not wsgi.allowed_file(file.filename):
+        return JSONResponse({'error': 'File type not allowed. Please upload .txt, .pdf, or .docx files'}, 400)
+
+    resume_id = str(uuid.uuid4())
+    filename = secure_filename(file.filename)
+    file_extension = os.path.splitext(filename)[1].lower()
+    s3_object_name = f"resumes/{resume_id}{file_extension}"
+    contents = await file.read()
+
+    # Upload to S3
+    if not await run_io(wsgi.upload_to_s3, BytesIO(contents), s3_object_name):
+        return JSONResponse({'error': 'Failed to upload file to storage'}, 500)
+
+    # Parse from the bytes already in hand rather than downloading them back
+    temp_path = None
+    try:
+        with tempfile.NamedTemporaryFile(suffix=file_extension, delete=False) as temp:
+            temp.write(contents)
+            temp_path = temp.name
+
+        resume_data = await run_cpu(parse_and_embed, temp_path)
+        if not resume_data:
+            await run_io(wsgi.delete_from_s3, s3_object_name)
+            return JSONResponse({'error': 'Could not process file format'}, 400)
+
+        # Store resume data
+        resume_data['id'] = resume_id
+        resume_data['name'] = filename
+        resume_data['s3_key'] = s3_object_name
+
+        # Save resume metadata to S3 (with its embedding, before indexing moves it)
+        resume_json = dumps(resume_data)
+        metadata_s3_key = f"resumes/{resume_id}.json"
+        if not await run_io(wsgi.upload_to_s3, BytesIO(resume_json), metadata_s3_key):
+            logger.warning(f"Failed to save resume metadata to s3://{wsgi.S3_BUCKET}/{metadata_s3_key}")
+
+        await run_cpu(wsgi.cache_resume, resume_id, resume_data)
+
+        return JSONResponse({
+            'id': resume_id,
+            'name': filename,
+            'file_type': resume_data.get('file_type', 'Unknown'),
+            'skills': resume_data.get('skills', [])
+        })
+    except Exception as e:
+        await run_io(wsgi.delete_from_s3, s3_object_name)
+        logger.error(f"Error processing resume: {str(e)}")
+        return JSONResponse({'error': f'Error processing resume: {str(e)}'}, 500)
+    finally:
+        if temp_path and os.path.exists(temp_path):
+            os.unlink(temp_path)
+
+async def process_job(request):
+    try:
+        try:
+            data = await request.json()
+        except ValueError:
+            data = None
+        if not data or not isinstance(data, dict):
+            return JSONResponse({'error': 'Invalid or missing JSON data'}, 400)
+
+        job_title = data.get('title', '').strip()
+        job_description = data.get('description', '').strip()
+        if not job_title:
+            return JSONResponse({'error': 'Job title is required'}, 400)
+        if not job_description:
+            return JSONResponse({'error': 'Job description is required'}, 400)
+
+        job_id = str(uuid.uuid4())
+        job_data = await run_cpu(wsgi.build_job, job_id, job_title, job_description)
+        wsgi.jobs[job_id] = job_data
+
+        # Save to S3
+        s3_key = f"jobs/{job_id}.json"
+        if not await run_io(wsgi.upload_to_s3, BytesIO(dumps(job_data)), s3_key):
+            logger.warning(f"Failed to save job to s3://{wsgi.S3_BUCKET}/{s3_key}")
+
+        return JSONResponse({
+            'id': job_id,
+            'title': job_title,
+            'skills': job_data['skills']
+        })
+    except Exception as e:
+        logger.error(f"Error processing job: {str(e)}")
+        return JSONResponse({'error': f'Error processing job: {str(e)}'}, 500)
+
+async def match(request):
+    try:
+        try:
+            data = await request.json()
+        except ValueError:
+            data = None
+        if not data:
+            return JSONResponse({'error': 'No JSON data provided'}, 400)
+
+        resume_id = data.get('resume_id')
+        job_id = data.get('job_id')
+        if not resume_id:
+            return JSONResponse({'error': 'Resume ID is required'}, 400)
+        if not job_id:
+            return JSONResponse({'error': 'Job ID is required'}, 400)
+
+        # Load resume and job concurrently
+        resume_data, job_data = await asyncio.gather(load_resume(resume_id), load_job(job_id))
+        if resume_data is None:
+            return JSONResponse({'error': 'Resume not found'}, 404)
+        if job_data is None:
+            return JSONResponse({'error': 'Job not found'}, 404)
+
+        try:
+            match_result = await run_cpu(match_resume_to_job, resume_data, job_data, timeout=10)
+        except asyncio.TimeoutError:
+            logger.error("Match calculation timed out")
+            return JSONResponse({'error': 'Match calculation timed out'}, 500)
+
+        return JSONResponse(match_result)
+    except Exception as e:
+        logger.error(f"Error in match calculation: {str(e)}")
+        return JSONResponse({'error': f'Error calculating match: {str(e)}'}, 500)
+
+async def get_resumes(request):
+    try:
+        try:
+            required_skills = wsgi.parse_skill_filter(request.query_params.get('skills', ''))
+        except ValueError as e:
+            return JSONResponse({'error': str(e)}, 400)
+        fields = wsgi.parse_fields(request.query_params.get('fields', 'id,name'))
+
+        # Fetch records not yet in memory concurrently
+        resume_ids = await list_record_ids('resumes/')
+        loaded = await asyncio.gather(*(load_resume(resume_id) for resume_id in resume_ids),
+                                      return_exceptions=True)
+        resume_ids = [resume_id for resume_id, resume in zip(resume_ids, loaded)
+                      if isinstance(resume, dict)]
+
+        resume_list = await run_cpu(wsgi.list_resumes, resume_ids, required_skills, fields)
+        return JSONResponse({'resumes': resume_list})
+    except Exception as e:
+        logger.error(f"Error getting resumes: {str(e)}")
+        return JSONResponse({'error': f'Error retrieving resumes: {str(e)}'}, 500)
+
+async def get_jobs(request):
+    try:
+        fields = wsgi.parse_fields(request.query_params.get('fields', 'id,title'))
+        job_ids = await list_record_ids('jobs/')
+        loaded = await asyncio.gather(*(load_job(job_id) for job_id in job_ids),
+                                      return_exceptions=True)
+        job_list = [wsgi.select_fields(job, fields, wsgi.JOB_HEAVY_FIELDS)
+                    for job in loaded if isinstance(job, dict)]
+        return JSONResponse({'jobs': job_list})
+    except Exception as e:
+        logger.error(f"Error getting jobs: {str(e)}")
+        return JSONResponse({'error': f'Error retrieving jobs: {str(e)}'}, 500)
+
+async def job_operations(request):
+    try:
+        job_id = request.path_params['job_id']
+        job = await load_job(job_id)
+        if job is None:
+            return JSONResponse({'error': 'Job not found'}, 404)
+
+        if request.method == 'GET':
+            fields = wsgi.parse_fields(request.query_params.get('fields', ''))
+            return JSONResponse({'job': wsgi.select_fields(job, fields, wsgi.JOB_HEAVY_FIELDS)})
+
+        await run_io(wsgi.delete_from_s3, f"jobs/{job_id}.json")
+        wsgi.jobs.pop(job_id, None)
+        return JSONResponse({'success': True})
+    except Exception as e:
+        logger.error(f"Error in job operations: {str(e)}")
+        return JSONResponse({'error': f'Error with job operation: {str(e)}'}, 500)
+
+async def resume_operations(request):
+    try:
+        resume_id = request.path_params['resume_id']
+        resume = await load_resume(resume_id)
+        if resume is None:
+            return JSONResponse({'error': 'Resume not found'}, 404)
+
+        if request.method == 'GET':
+            fields = wsgi.parse_fields(request.query_params.get('fields', ''))
+            return JSONResponse({'resume': wsgi.select_resume_fields(resume_id, resume, fields)})
+
+        # Delete the uploaded file and its metadata concurrently
+        s3_keys = [key for key in (resume.get('s3_key'), f"resumes/{resume_id}.json") if key]
+        await asyncio.gather(*(run_io(wsgi.delete_from_s3, key) for key in s3_keys))
+        await run_cpu(wsgi.drop_resume, resume_id)
+        return JSONResponse({'success': True})
+    except Exception as e:
+        logger.error(f"Error in resume operations: {str(e)}")
+        return JSONResponse({'error': f'Error with resume operation: {str(e)}'}, 500)
+
+async def search_resumes(request):
+    try:
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return JSONResponse({'error': 'Search query is required'}, 400)
+
+        try:
+            limit, alpha, rescore, hybrid = wsgi.parse_search_params(request.query_params)
+            required_skills = wsgi.parse_skill_filter(request.query_params.get('skills', ''))
+        except ValueError as e:
+            return JSONResponse({'error': str(e)}, 400)
+
+        fields = wsgi.parse_fields(request.query_params.get('fields', ''))
+
+        results = await run_cpu(wsgi.search_resume_hits, query, limit, alpha, rescore, hybrid,
+                                required_skills, timeout=60)
+        return JSONResponse({'query': query, 'results': [wsgi.select_fields(row, fields) for row in results]})
+    except Exception as e:
+        logger.error(f"Error searching resumes: {str(e)}")
+        return JSONResponse({'error': f'Error searching resumes: {str(e)}'}, 500)
+
+async def reindex(request):
+    if request.method == 'POST':
+        if not wsgi.reindex_job.start():
+            return JSONResponse({'error': 'Re-index already running', 'status': wsgi.reindex_job.status}, 409)
+        return JSONResponse({'status': wsgi.reindex_job.status}, 202)
+    return JSONResponse({'status': wsgi.reindex_job.status})
+
+async def rank_resumes(request):
+    try:
+        job_id = request.path_params['job_id']
+        job_data = await load_job(job_id)
+        if job_data is None:
+            return JSONResponse({'error': 'Job not found'}, 404)
+
+        try:
+            limit, rescore = wsgi.parse_rank_params(request.query_params)
+            required_skills = wsgi.parse_skill_filter(request.query_params.get('skills', ''))
+        except ValueError as e:
+            return JSONResponse({'error': str(e)}, 400)
+
+        try:
+            ranking = await run_cpu(wsgi.rank_job_candidates, job_data, required_skills, rescore, timeout=60)
+        except asyncio.TimeoutError:
+            logger.error("Ranking calculation timed out")
+            return JSONResponse({'error': 'Ranking calculation timed out'}, 500)
+
+        fields = wsgi.parse_fields(request.query_params.get('fields', ''))
+        return JSONResponse({'job_id': job_id, 'results': [wsgi.select_fields(row, fields) for row in ranking[:limit]]})
+    except Exception as e:
+        logger.error(f"Error ranking resumes: {str(e)}")
+        return JSONResponse({'error': f'Error ranking resumes: {str(e)}'}, 500)
+
+app = Starlette(routes=[
+    Route('/api/process_resume', process_resume, methods=['POST']),
+    Route('/api/process_job', process_job, methods=['POST']),
+    Route('/api/match', match, methods=['POST']),
+    Route('/api/resumes', get_resumes, methods=['GET']),
+    Route('/api/resumes/search', search_resumes, methods=['GET']),
+    Route('/api/resumes/{resume_id}', resume_operations, methods=['GET', 'DELETE']),
+    Route('/api/jobs', get_jobs, methods=['GET']),
+    Route('/api/jobs/{job_id}', job_operations, methods=['GET', 'DELETE']),
+    Route('/api/jobs/{job_id}/rank', rank_resumes, methods=['GET']),
+    Route('/api/reindex', reindex, methods=['GET', 'POST']),
+    # Everything else (the index page) is served by Flask
+    Mount('/', app=WSGIMiddleware(wsgi.app, workers=wsgi.IO_CONCURRENCY))
+], middleware=[Middleware(CompressionMiddleware)])
@@ -0,0 +1,94 @@
+"""Mixed upload/match load against a running server.
+
+Start the server in one of the two modes, then point this script at it:
+
+    gunicorn --workers=4 --threads=2 --timeout=120 --bind 0.0.0.0:5000 app:app
+    gunicorn --workers=4 -k uvicorn.workers.UvicornWorker --timeout=120 --bind 0.0.0.0:5000 asgi:app
+
+    python benchmarks/bench_serving.py --url http://localhost:5000 --requests 400 --concurrency 32
+"""
+import os
+import json
+import time
+import uuid
+import random
+import argparse
+import statistics
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_RESUME = os.path.join(os.path.dirname(__file__), '..', 'utils', 'uploads',
+                              '85272f33-6ee8-4272-874c-0c3c4a35ad9e.pdf')
+
+def post_json(url, payload):
+    request = urllib.request.Request(url, data=json.dumps(payload).encode('utf-8'),
+                                     headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(request, timeout=120) as response:
+        return json.loads(response.read())
+
+def post_file(url, file_path):
+    boundary = uuid.uuid4().hex
+    with open(file_path, 'rb') as file:
+        contents = file.read()
+    body = (
+        f"--{boundary}\r\n"
+        f"Content-Disposition: form-data; name=\"resume\"; filename=\"{os.path.basename(file_path)}\"\r\n"
+        f"Content-Type: application/octet-stream\r\n\r\n"
+    ).encode('utf-8') + contents + f"\r\n--{boundary}--\r\n".encode('utf-8')
+    request = urllib.request.Request(url, data=body,
+                                     headers={'Content-Type': f'multipart/form-data; boundary={boundary}'})
+    with urllib.request.urlopen(request, timeout=120) as response:
+        return json.loads(response.read())
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', default='http://localhost:5000')
+    parser.add_argument('--resume', default=DEFAULT_RESUME)
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--upload-ratio', type=float, default=0.2,
+                        help='fraction of requests that upload a resume; the rest are matches')
+    args = parser.parse_args()
+
+    # Seed one job and one resume to match against
+    job = post_json(f"{args.url}/api/process_job", {
+        'title': 'Backend Engineer',
+        'description': 'Python, AWS, Docker and SQL experience building REST APIs with Flask.'
+    })
+    resume = post_file(f"{args.url}/api/process_resume", args.resume)
+
+    def one_request(_):
+        operation = 'upload' if random.random() < args.upload_ratio else 'match'
+        start = time.perf_counter()
+        try:
+            if operation == 'upload':
+                post_file(f"{args.url}/api/process_resume", args.resume)
+            else:
+                post_json(f"{args.url}/api/match", {'resume_id': resume['id'], 'job_id': job['id']})
+            ok = True
+        except Exception:
+            ok = False
+        return operation, ok, time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(one_request, range(args.requests)))
+    elapsed = time.perf_counter() - start
+
+    print(f"{args.requests} requests, concurrency {args.concurrency}: "
+          f"{elapsed:.1f}s, {args.requests / elapsed:.1f} req/s")
+    for operation in ('upload', 'match'):
+        latencies = [latency for op, ok, latency in results if op == operation and ok]
+        errors = sum(1 for op, ok, _ in results if op == operation and not ok)
+        if latencies:
+            print(f"  {operation:6s} n={len(latencies):4d} errors={errors:3d} "
+                  f"p50={statistics.median(latencies) * 1000:.0f}ms "
+                  f"p95={percentile(latencies, 0.95) * 1000:.0f}ms "
+                  f"max={max(latencies) * 1000:.0f}ms")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""Memory and ranking agreement of quantized embeddings vs float32 cosine.
+
+    python benchmarks/bench_vector_store.py --docs 5000 --queries 50
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.resume_parser import COMMON_SKILLS
+from utils.matching import model, calculate_similarity
+from utils.vector_store import QuantizedVectorStore
+
+def synthetic_text(rng):
+    skills = rng.sample(COMMON_SKILLS, rng.randint(4, 12))
+    return f"experienced engineer skilled in {', '.join(skills)} with {rng.randint(1, 15)} years of work"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--docs', type=int, default=5000)
+    parser.add_argument('--queries', type=int, default=50)
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--rescore', type=int, default=50)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    documents = [synthetic_text(rng) for _ in range(args.docs)]
+    queries = [synthetic_text(rng) for _ in range(args.queries)]
+    doc_embeddings = model.encode(documents, batch_size=64)
+    query_embeddings = model.encode(queries)
+
+    normalized = doc_embeddings / np.linalg.norm(doc_embeddings, axis=1, keepdims=True)
+    exact = (query_embeddings / np.linalg.norm(query_embeddings, axis=1, keepdims=True)) @ normalized.T
+
+    # The float32 baseline must agree with calculate_similarity itself
+    drift = max(abs(exact[i, i] - calculate_similarity(queries[i], documents[i])) for i in range(5))
+    print(f"float32 baseline vs calculate_similarity: max |diff| = {drift:.2e}")
+
+    float32_bytes = doc_embeddings.astype(np.float32).nbytes
+    list_bytes = sys.getsizeof(doc_embeddings[0].tolist()) * args.docs + 24 * doc_embeddings.size
+    print(f"{args.docs} docs: float32 array {float32_bytes / 1e6:.2f} MB, "
+          f"JSON-decoded lists ~{list_bytes / 1e6:.2f} MB")
+
+    ids = [str(i) for i in range(args.docs)]
+    for dtype in ('float16', 'int8'):
+        store = QuantizedVectorStore(doc_embeddings.shape[1], dtype)
+        for doc_id, embedding in zip(ids, doc_embeddings):
+            store.add(doc_id, embedding)
+
+        recall, recall_rescored, errors, elapsed = [], [], [], 0.0
+        for q, query in enumerate(query_embeddings):
+            start = time.perf_counter()
+            scores = store.scores(query)
+            elapsed += time.perf_counter() - start
+
+            approximate = np.array([scores[doc_id] for doc_id in ids])
+            errors.append(np.abs(approximate - exact[q]).mean())
+            truth = set(np.argsort(-exact[q])[:args.top])
+            recall.append(len(truth & set(np.argsort(-approximate)[:args.top])) / args.top)
+
+            # Exact float32 rescoring of the approximate top candidates
+            candidates = np.argsort(-approximate)[:args.rescore]
+            rescored = candidates[np.argsort(-exact[q][candidates])][:args.top]
+            recall_rescored.append(len(truth & set(rescored)) / args.top)
+
+        print(f"{dtype:8s} {store.nbytes / 1e6:6.2f} MB ({float32_bytes / store.nbytes:.1f}x smaller), "
+              f"mean |err| {np.mean(errors):.4f}, recall@{args.top} {np.mean(recall):.3f}, "
+              f"with top-{args.rescore} rescoring {np.mean(recall_rescored):.3f}, "
+              f"{elapsed / args.queries * 1000:.2f} ms/query")
+
+if __name__ == '__main__':
+    main()
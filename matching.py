@@ -4,7 +4,11 @@ import numpy as np
 from utils.nlp_processor import extract_skills
 
 # Load sentence transformer model
-model = SentenceTransformer('paraphrase-MiniLM-L6-v2')
+MODEL_NAME = 'paraphrase-MiniLM-L6-v2'
+model = SentenceTransformer(MODEL_NAME)
+
+# Stored embeddings tagged with a different version are recomputed
+MODEL_VERSION = MODEL_NAME
 
 def get_text_embedding(text):
     """Convert text to embedding vector"""
@@ -22,6 +26,31 @@ def calculate_similarity(text1, text2):
     similarity = cosine_similarity(embedding1, embedding2)[0][0]
     return float(similarity)
 
+def embedding_similarities(query_text, resume_list, vector_store, rescore=0):
+    """Cosine similarity of each resume to the query text.
+
+    Scores come from the vector store's compact vectors (resumes missing from
+    it are encoded and added). The top `rescore` are recomputed exactly in
+    float32; only quantized vectors are kept in memory, so this re-encodes
+    their text and costs `rescore` extra model passes per call.
+    """
+    query_embedding = get_text_embedding(query_text)
+    missing = [resume for resume in resume_list if resume['id'] not in vector_store]
+    if missing:
+        encoded = model.encode([resume['processed_text'] for resume in missing])
+        for resume, embedding in zip(missing, encoded):
+            vector_store.add(resume['id'], embedding)
+
+    approximate = vector_store.scores(query_embedding, [resume['id'] for resume in resume_list])
+    # A resume deleted concurrently drops out of the store; score it as unrelated
+    similarities = np.array([approximate.get(resume['id'], 0.0) for resume in resume_list], dtype=np.float32)
+
+    if rescore > 0:
+        top = np.argsort(-similarities)[:rescore]
+        exact = model.encode([resume_list[i]['processed_text'] for i in top])
+        similarities[top] = cosine_similarity(exact, query_embedding.reshape(1, -1))[:, 0]
+    return similarities
+
 def match_resume_to_job(resume_data, job_data):
     """Match resume to job and calculate score"""
     # Get text similarity
@@ -52,4 +81,50 @@ def match_resume_to_job(resume_data, job_data):
         'skill_match_score': skill_match_score,
         'matching_skills': list(matching_skills),
         'missing_skills': list(missing_skills)
-    }
\ No newline at end of file
+    }
+
+def rank_resumes_for_job(resume_list, job_data, skill_scores, vector_store, rescore=0):
+    """Rank resumes against a job using precomputed skill match scores"""
+    if not resume_list:
+        return []
+
+    # Score against the stored compact vectors; only resumes missing from the store are encoded
+    similarities = embedding_similarities(job_data['processed_text'], resume_list, vector_store, rescore)
+
+    results = []
+    for resume, text_similarity in zip(resume_list, similarities):
+        text_similarity = float(text_similarity)
+        skill_match_score = skill_scores.get(resume['id'], 0)
+        results.append({
+            'resume_id': resume['id'],
+            'name': resume.get('name'),
+            'match_score': 0.6 * text_similarity + 0.4 * skill_match_score,
+            'text_similarity': text_similarity,
+            'skill_match_score': skill_match_score
+        })
+
+    results.sort(key=lambda result: result['match_score'], reverse=True)
+    return results
+
+def hybrid_search_scores(query_text, resume_list, lexical_scores, vector_store, alpha=0.5, rescore=0):
+    """Blend normalized BM25 scores with embedding similarity to the query"""
+    if not resume_list:
+        return []
+
+    similarities = embedding_similarities(query_text, resume_list, vector_store, rescore)
+    max_lexical = max(lexical_scores.values()) or 1.0
+
+    results = []
+    for resume, semantic_score in zip(resume_list, similarities):
+        lexical_score = lexical_scores[resume['id']]
+        semantic_score = float(semantic_score)
+        results.append({
+            'id': resume['id'],
+            'name': resume.get('name'),
+            'score': alpha * lexical_score / max_lexical + (1 - alpha) * semantic_score,
+            'lexical_score': lexical_score,
+            'semantic_score': semantic_score
+        })
+
+    results.sort(key=lambda result: result['score'], reverse=True)
+    return results
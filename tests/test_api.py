@@ -0,0 +1,173 @@
+import io
+import gzip
+import json
+import numpy as np
+import pytest
+
+for module in ('flask', 'boto3', 'spacy', 'nltk', 'PyPDF2', 'docx', 'sentence_transformers'):
+    pytest.importorskip(module)
+
+from botocore.exceptions import ClientError
+
+class FakeS3:
+    """In-memory stand-in for the handful of S3 calls the app makes"""
+
+    def __init__(self):
+        self.objects = {}
+
+    def _missing(self, key):
+        return ClientError({'Error': {'Code': 'NoSuchKey', 'Message': key}}, 'GetObject')
+
+    def get_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise self._missing(Key)
+        return {'Body': io.BytesIO(self.objects[Key]), 'ETag': f'"{hash(self.objects[Key])}"'}
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.objects[Key] = Body if isinstance(Body, bytes) else Body.encode('utf-8')
+
+    def upload_fileobj(self, file_obj, bucket, key):
+        self.objects[key] = file_obj.read()
+
+    def download_fileobj(self, bucket, key, file_obj):
+        if key not in self.objects:
+            raise self._missing(key)
+        file_obj.write(self.objects[key])
+
+    def delete_object(self, Bucket, Key):
+        self.objects.pop(Key, None)
+
+    def list_objects_v2(self, Bucket, Prefix):
+        keys = sorted(key for key in self.objects if key.startswith(Prefix))
+        return {'Contents': [{'Key': key} for key in keys]} if keys else {}
+
+    def get_paginator(self, name):
+        fake = self
+
+        class Paginator:
+            def paginate(self, Bucket, Prefix):
+                yield fake.list_objects_v2(Bucket, Prefix)
+        return Paginator()
+
+@pytest.fixture(scope='module')
+def wsgi(tmp_path_factory):
+    import boto3
+    with pytest.MonkeyPatch.context() as patch:
+        # The app builds its client, indexes and local files at import time
+        patch.chdir(tmp_path_factory.mktemp('app'))
+        patch.setattr(boto3, 'client', lambda *args, **kwargs: FakeS3())
+        import app
+    return app
+
+@pytest.fixture(scope='module')
+def resume(wsgi):
+    embedding = np.random.default_rng(0).standard_normal(wsgi.vector_store.dim)
+    record = {
+        'id': 'r1',
+        'name': 'resume.pdf',
+        'raw_text': 'Python developer with AWS and Docker experience. ' * 60,
+        'processed_text': 'python developer aws docker experience ' * 60,
+        'skills': ['python', 'aws', 'docker'],
+        'embedding': embedding.tolist(),
+        'model_version': wsgi.MODEL_VERSION
+    }
+    wsgi.s3_client.put_object(Bucket=wsgi.S3_BUCKET, Key='resumes/r1.json', Body=json.dumps(record))
+    wsgi.cache_resume('r1', dict(record))
+    return record
+
+@pytest.fixture(scope='module')
+def client(wsgi, resume):
+    return wsgi.app.test_client()
+
+def test_vector_store_matches_encoder_dimension(wsgi):
+    from utils.matching import get_text_embedding
+    assert wsgi.vector_store.dim == len(get_text_embedding('python developer'))
+
+def test_listing_projects_requested_fields(client):
+    response = client.get('/api/resumes?fields=id,skills')
+    assert response.status_code == 200
+    assert response.get_json()['resumes'] == [{'id': 'r1', 'skills': ['python', 'aws', 'docker']}]
+
+def test_detail_excludes_heavy_fields_by_default(client):
+    record = client.get('/api/resumes/r1').get_json()['resume']
+    assert record['name'] == 'resume.pdf'
+    assert not {'raw_text', 'clean_text', 'processed_text', 'embedding'} & set(record)
+
+def test_requested_embedding_is_restored_from_vector_store(client, resume):
+    record = client.get('/api/resumes/r1?fields=id,embedding').get_json()['resume']
+    embedding = np.array(record['embedding'])
+    original = np.array(resume['embedding'])
+    assert len(embedding) == len(original)
+    assert embedding @ original / (np.linalg.norm(embedding) * np.linalg.norm(original)) > 0.99
+
+def test_unknown_skills_are_rejected(client):
+    response = client.get('/api/resumes?skills=python,pyhton')
+    assert response.status_code == 400
+    assert 'pyhton' in response.get_json()['error']
+
+def test_invalid_limit_is_rejected(client):
+    assert client.get('/api/resumes/search?q=python&limit=-5').status_code == 400
+
+def test_result_rows_are_projected(client):
+    job = client.post('/api/process_job', json={'title': 'Engineer', 'description': 'Python and AWS'}).get_json()
+    rows = client.get(f"/api/jobs/{job['id']}/rank?fields=resume_id,skill_match_score").get_json()['results']
+    assert rows == [{'resume_id': 'r1', 'skill_match_score': 1.0}]
+
+    rows = client.get('/api/resumes/search?q=python&fields=id').get_json()['results']
+    assert rows == [{'id': 'r1'}]
+
+def test_large_response_is_compressed_per_accept_encoding(client):
+    response = client.get('/api/resumes/r1?fields=raw_text', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert json.loads(gzip.decompress(response.data))['resume']['raw_text'].startswith('Python developer')
+
+    response = client.get('/api/resumes/r1?fields=raw_text')
+    assert 'Content-Encoding' not in response.headers
+    assert 'Accept-Encoding' in response.headers['Vary']
+
+def test_small_response_is_not_compressed(client):
+    response = client.get('/api/resumes/r1?fields=id', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in response.headers
+
+@pytest.fixture(scope='module')
+def async_client(wsgi, resume):
+    for module in ('starlette', 'httpx', 'a2wsgi'):
+        pytest.importorskip(module)
+    from starlette.testclient import TestClient
+    import asgi
+    return TestClient(asgi.app)
+
+def test_async_projection_and_embedding(async_client, resume):
+    record = async_client.get('/api/resumes/r1').json()['resume']
+    assert not {'raw_text', 'processed_text', 'embedding'} & set(record)
+
+    record = async_client.get('/api/resumes/r1?fields=id,embedding').json()['resume']
+    assert set(record) == {'id', 'embedding'}
+    assert len(record['embedding']) == len(resume['embedding'])
+
+def test_async_compression_follows_accept_encoding_and_size(async_client):
+    response = async_client.get('/api/resumes/r1?fields=raw_text', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['content-encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['vary']
+    assert response.json()['resume']['raw_text'].startswith('Python developer')
+
+    response = async_client.get('/api/resumes/r1?fields=raw_text', headers={'Accept-Encoding': 'identity'})
+    assert 'content-encoding' not in response.headers
+
+    response = async_client.get('/api/resumes/r1?fields=id', headers={'Accept-Encoding': 'gzip'})
+    assert 'content-encoding' not in response.headers
+
+def test_async_compression_merges_existing_vary(async_client):
+    from starlette.applications import Starlette
+    from starlette.routing import Route
+    from starlette.testclient import TestClient
+    import asgi
+
+    async def endpoint(request):
+        return asgi.JSONResponse({'text': 'x' * 4096}, headers={'Vary': 'Cookie'})
+    client = TestClient(asgi.CompressionMiddleware(Starlette(routes=[Route('/', endpoint)])))
+
+    response = client.get('/', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['content-encoding'] == 'gzip'
+    assert {value.strip() for value in response.headers['vary'].split(',')} == {'Cookie', 'Accept-Encoding'}
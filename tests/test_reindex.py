@@ -0,0 +1,140 @@
+import io
+import json
+import hashlib
+import pytest
+
+for module in ('spacy', 'nltk', 'PyPDF2', 'docx', 'sentence_transformers', 'botocore'):
+    pytest.importorskip(module)
+
+from botocore.exceptions import ClientError
+from utils.reindex import ReindexJob
+from utils.resume_parser import SKILLS_VERSION
+from utils.matching import MODEL_VERSION
+
+def etag(body):
+    return f'"{hashlib.md5(body.encode("utf-8")).hexdigest()}"'
+
+def client_error(code):
+    return ClientError({'Error': {'Code': code}}, 'PutObject')
+
+class FakeS3:
+    def __init__(self, objects, fail_puts=()):
+        self.objects = {key: json.dumps(value) for key, value in objects.items()}
+        self.fail_puts = set(fail_puts)
+        self.after_get = {}
+
+    def get_paginator(self, name):
+        objects = self.objects
+
+        class Paginator:
+            def paginate(self, Bucket, Prefix):
+                yield {'Contents': [{'Key': key} for key in objects if key.startswith(Prefix)]}
+        return Paginator()
+
+    def get_object(self, Bucket, Key):
+        body = self.objects[Key]
+        if Key in self.after_get:
+            self.after_get.pop(Key)(Key)
+        return {'Body': io.BytesIO(body.encode('utf-8')), 'ETag': etag(body)}
+
+    def put_object(self, Bucket, Key, Body, IfMatch=None):
+        if Key in self.fail_puts:
+            raise IOError('put failed')
+        if IfMatch is not None:
+            if Key not in self.objects:
+                raise client_error('NoSuchKey')
+            if etag(self.objects[Key]) != IfMatch:
+                raise client_error('PreconditionFailed')
+        self.objects[Key] = Body if isinstance(Body, str) else Body.decode('utf-8')
+
+def stale_resume(resume_id):
+    return {'id': resume_id, 'raw_text': 'Python and AWS developer', 'skills': [],
+            'skills_version': 'old', 'model_version': MODEL_VERSION}
+
+@pytest.fixture
+def checkpoint(tmp_path):
+    return str(tmp_path / 'reindex_checkpoint.jsonl')
+
+def test_refresh_record_recomputes_stale_skills():
+    job = ReindexJob(None, 'bucket')
+    record = stale_resume('a')
+    assert job.refresh_record('resumes/a.json', record)
+    assert record['skills_version'] == SKILLS_VERSION
+    assert 'python' in record['skills']
+
+def test_refresh_record_skips_current_records():
+    job = ReindexJob(None, 'bucket')
+    record = {'raw_text': 'Python', 'skills': ['python'], 'skills_version': SKILLS_VERSION}
+    assert not job.refresh_record('resumes/a.json', record)
+    assert record['skills'] == ['python']
+
+def test_refresh_record_drops_derivable_clean_text():
+    job = ReindexJob(None, 'bucket')
+    record = {'raw_text': 'Python', 'clean_text': 'python', 'skills_version': SKILLS_VERSION}
+    assert job.refresh_record('resumes/a.json', record)
+    assert 'clean_text' not in record
+
+def test_refresh_record_uses_job_description():
+    job = ReindexJob(None, 'bucket')
+    record = {'description': 'Looking for Docker experience', 'skills_version': 'old'}
+    assert job.refresh_record('jobs/j.json', record)
+    assert 'docker' in record['skills']
+
+def test_run_updates_only_saved_records(checkpoint):
+    s3 = FakeS3({'resumes/a.json': stale_resume('a'), 'resumes/b.json': stale_resume('b')},
+                fail_puts={'resumes/b.json'})
+    updates = []
+    job = ReindexJob(s3, 'bucket', checkpoint_path=checkpoint,
+                     on_update=lambda key, record: updates.append(key))
+    job.start()
+    job._thread.join()
+    assert updates == ['resumes/a.json']
+    assert job.status['updated'] == 1 and job.status['failed'] == 1
+
+    # The next run resumes the unfinished log and only retries the failed key
+    s3.fail_puts.clear()
+    updates.clear()
+    job.start()
+    job._thread.join()
+    assert updates == ['resumes/b.json']
+    assert job.status['processed'] == 2 and job.status['updated'] == 1
+
+def test_other_process_reloads_updated_records(checkpoint):
+    s3 = FakeS3({'resumes/a.json': stale_resume('a')})
+    runner = ReindexJob(s3, 'bucket', checkpoint_path=checkpoint)
+    updates = []
+    follower = ReindexJob(s3, 'bucket', checkpoint_path=checkpoint,
+                          on_update=lambda key, record: updates.append((key, record['skills_version'])))
+    follower._seek_checkpoint_end()
+
+    runner.start()
+    runner._thread.join()
+    assert follower.apply_remote_updates() == 1
+    assert updates == [('resumes/a.json', SKILLS_VERSION)]
+    assert follower.apply_remote_updates() == 0
+
+def test_start_refuses_while_locked_elsewhere(checkpoint):
+    pytest.importorskip('fcntl')
+    from utils.file_lock import try_lock, release
+    fd = try_lock(f"{checkpoint}.lock")
+    try:
+        assert not ReindexJob(FakeS3({}), 'bucket', checkpoint_path=checkpoint).start()
+    finally:
+        release(fd)
+
+def test_record_deleted_or_replaced_mid_batch_is_not_written_back(checkpoint):
+    s3 = FakeS3({'resumes/a.json': stale_resume('a'), 'resumes/b.json': stale_resume('b'),
+                 'resumes/c.json': stale_resume('c')})
+    replacement = json.dumps({**stale_resume('c'), 'name': 'new upload'})
+    s3.after_get = {'resumes/a.json': lambda key: s3.objects.pop(key),
+                    'resumes/c.json': lambda key: s3.objects.__setitem__(key, replacement)}
+    updates = []
+    job = ReindexJob(s3, 'bucket', checkpoint_path=checkpoint,
+                     on_update=lambda key, record: updates.append(key))
+    job.start()
+    job._thread.join()
+
+    assert 'resumes/a.json' not in s3.objects
+    assert s3.objects['resumes/c.json'] == replacement
+    assert updates == ['resumes/b.json']
+    assert job.status['updated'] == 1 and job.status['failed'] == 0
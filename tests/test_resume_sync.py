@@ -0,0 +1,50 @@
+import io
+import json
+from utils.resume_sync import ResumeSync
+
+class FakeS3:
+    def __init__(self, resume_ids, page_size=2):
+        self.objects = {f"resumes/{resume_id}.json": json.dumps({'id': resume_id}) for resume_id in resume_ids}
+        self.page_size = page_size
+
+    def get_paginator(self, name):
+        fake = self
+
+        class Paginator:
+            def paginate(self, Bucket, Prefix):
+                keys = sorted(key for key in fake.objects if key.startswith(Prefix))
+                for start in range(0, len(keys), fake.page_size):
+                    yield {'Contents': [{'Key': key} for key in keys[start:start + fake.page_size]]}
+        return Paginator()
+
+    def get_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise KeyError(Key)
+        return {'Body': io.BytesIO(self.objects[Key].encode('utf-8'))}
+
+def make_sync(s3, resumes):
+    return ResumeSync(s3, 'bucket', lambda: list(resumes),
+                      on_add=resumes.__setitem__, on_remove=lambda resume_id: resumes.pop(resume_id, None))
+
+def test_adds_records_uploaded_elsewhere_across_pages():
+    resumes = {'a': {'id': 'a'}}
+    sync = make_sync(FakeS3(['a', 'b', 'c', 'd', 'e']), resumes)
+    assert sync.sync_once() == (4, 0)
+    assert sorted(resumes) == ['a', 'b', 'c', 'd', 'e']
+    assert sync.sync_once() == (0, 0)
+
+def test_removes_records_deleted_elsewhere():
+    resumes = {'a': {'id': 'a'}, 'b': {'id': 'b'}}
+    sync = make_sync(FakeS3(['b']), resumes)
+    assert sync.sync_once() == (0, 1)
+    assert list(resumes) == ['b']
+
+def test_record_deleted_after_listing_is_skipped():
+    s3 = FakeS3(['a'])
+    resumes = {}
+    sync = make_sync(s3, resumes)
+    listed = sync._list_ids()
+    sync._list_ids = lambda: listed
+    del s3.objects['resumes/a.json']
+    assert sync.sync_once() == (0, 0)
+    assert resumes == {}
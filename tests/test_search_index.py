@@ -0,0 +1,138 @@
+import os
+import time
+import threading
+import numpy as np
+import pytest
+from utils.search_index import BM25Index
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'search_index.npz')
+
+def ids(results):
+    return [doc_id for doc_id, _ in results]
+
+def test_search_ranks_by_bm25():
+    index = BM25Index()
+    index.add('a', 'python developer aws')
+    index.add('b', 'java developer')
+    index.add('c', 'python python data')
+    assert ids(index.search(['python', 'developer'])) == ['a', 'c', 'b']
+    assert index.search(['rust']) == []
+
+def test_search_limit_and_candidates():
+    index = BM25Index()
+    for i in range(20):
+        index.add(str(i), 'python ' * (i + 1))
+    assert len(index.search(['python'], limit=5)) == 5
+    assert ids(index.search(['python'], candidates={'3', '7'})) == ['7', '3']
+
+def test_remove_and_readd():
+    index = BM25Index()
+    index.add('a', 'python')
+    index.add('b', 'python')
+    index.remove('a')
+    assert 'a' not in index and len(index) == 1
+    assert ids(index.search(['python'])) == ['b']
+    index.add('b', 'java')
+    assert index.search(['python']) == []
+    assert ids(index.search(['java'])) == ['b']
+
+def test_compaction_keeps_results():
+    index = BM25Index()
+    for i in range(200):
+        index.add(str(i), f'common term{i}')
+    for i in range(150):
+        index.remove(str(i))
+    assert len(index.slot_ids) < 200
+    assert sorted(ids(index.search(['common'], limit=100))) == sorted(str(i) for i in range(150, 200))
+    assert ids(index.search(['term170'])) == ['170']
+
+def test_snapshot_and_journal_replay(path):
+    index = BM25Index(path)
+    assert index.is_writer
+    index.sync({'a': 'python developer', 'b': 'java developer'})
+    index.add('c', 'python data')
+    index.remove('b')
+    assert os.path.exists(path) and os.path.exists(f"{path}.journal")
+
+    reloaded = BM25Index(path)
+    reloaded.load()
+    assert sorted(reloaded.slot_of) == ['a', 'c']
+    assert reloaded.search(['python']) == index.search(['python'])
+
+def test_journal_compacts_into_snapshot(path):
+    index = BM25Index(path, compact_after=2)
+    index.add('a', 'python')
+    index.add('b', 'java')
+    assert not os.path.exists(f"{path}.journal")
+    index._snapshot_thread.join()
+    assert os.path.exists(path) and not os.path.exists(f"{path}.journal.prev")
+
+    reloaded = BM25Index(path)
+    reloaded.load()
+    assert sorted(reloaded.slot_of) == ['a', 'b']
+
+def test_torn_journal_line_is_skipped(path):
+    index = BM25Index(path)
+    index.add('a', 'python')
+    with open(f"{path}.journal", 'a', encoding='utf-8') as journal:
+        journal.write('{"op": "add", "id": "b"')
+
+    reloaded = BM25Index(path)
+    reloaded.load()
+    assert list(reloaded.slot_of) == ['a']
+
+def test_only_lock_owner_writes(path):
+    pytest.importorskip('fcntl')
+    owner = BM25Index(path)
+    other = BM25Index(path)
+    assert owner.is_writer and not other.is_writer
+
+    other.sync({'x': 'python'})
+    other.add('y', 'java')
+    assert not os.path.exists(path)
+    assert not os.path.exists(f"{path}.journal")
+    assert ids(other.search(['java'])) == ['y']
+
+def test_search_not_blocked_while_snapshot_is_written(path, monkeypatch):
+    started, release = threading.Event(), threading.Event()
+    savez = np.savez
+
+    def slow_savez(*args, **kwargs):
+        started.set()
+        release.wait(5)
+        savez(*args, **kwargs)
+    monkeypatch.setattr(np, 'savez', slow_savez)
+
+    index = BM25Index(path, compact_after=3)
+    for doc_id in 'abc':
+        index.add(doc_id, 'python developer')
+    assert started.wait(5)
+
+    # The snapshot is stuck mid-write; updates and searches still go through
+    began = time.perf_counter()
+    index.add('d', 'python')
+    index.remove('a')
+    assert sorted(ids(index.search(['python']))) == ['b', 'c', 'd']
+    assert time.perf_counter() - began < 1
+    assert index._snapshot_thread.is_alive()
+
+    release.set()
+    index._snapshot_thread.join(5)
+    reloaded = BM25Index(path)
+    reloaded.load()
+    assert sorted(reloaded.slot_of) == ['b', 'c', 'd']
+    assert reloaded.search(['python']) == index.search(['python'])
+
+def test_snapshot_skips_removed_documents(path):
+    index = BM25Index(path)
+    index.sync({'a': 'python', 'b': 'python java', 'c': 'java'})
+    index.remove('b')
+    index.save()
+    assert not os.path.exists(f"{path}.journal")
+
+    reloaded = BM25Index(path)
+    reloaded.load()
+    assert sorted(reloaded.slot_of) == ['a', 'c']
+    assert ids(reloaded.search(['java'])) == ['c']
@@ -0,0 +1,43 @@
+import gzip
+import pytest
+from utils import serialization
+from utils.serialization import dumps, loads, negotiate_encoding, compress
+
+def test_dumps_loads_round_trip():
+    record = {'id': 'a', 'skills': ['python', 'c++'], 'score': 0.5, 'name': 'Résumé'}
+    data = dumps(record)
+    assert isinstance(data, bytes)
+    assert loads(data) == record
+    assert loads(data.decode('utf-8')) == record
+
+def test_negotiate_gzip():
+    assert negotiate_encoding('gzip, deflate') == 'gzip'
+    assert negotiate_encoding('*') == 'gzip'
+
+def test_negotiate_respects_zero_quality():
+    assert negotiate_encoding('gzip;q=0') is None
+    assert negotiate_encoding('*;q=0') is None
+    assert negotiate_encoding('gzip;q=0, *') is None
+
+def test_negotiate_nothing_acceptable():
+    assert negotiate_encoding('') is None
+    assert negotiate_encoding('identity') is None
+    assert negotiate_encoding('gzip;q=bad') is None
+
+def test_negotiate_prefers_brotli_when_available(monkeypatch):
+    monkeypatch.setattr(serialization, 'brotli', object())
+    assert negotiate_encoding('gzip, br') == 'br'
+    monkeypatch.setattr(serialization, 'brotli', None)
+    assert negotiate_encoding('gzip, br') == 'gzip'
+    assert negotiate_encoding('br') is None
+
+def test_gzip_round_trip():
+    body = dumps({'results': [{'id': str(i), 'score': i} for i in range(200)]})
+    compressed = compress(body, 'gzip')
+    assert len(compressed) < len(body)
+    assert gzip.decompress(compressed) == body
+
+def test_brotli_round_trip():
+    brotli = pytest.importorskip('brotli')
+    body = dumps({'text': 'python developer ' * 200})
+    assert brotli.decompress(compress(body, 'br')) == body
@@ -0,0 +1,61 @@
+import pytest
+from utils.skill_index import SkillIndex
+
+SKILLS = ["python", "aws", "docker", "c++"]
+
+@pytest.fixture
+def index():
+    index = SkillIndex(SKILLS, chunk_size=2)
+    index.add('a', ['python', 'aws'])
+    index.add('b', ['python'])
+    index.add('c', ['c++', 'docker'])
+    return index
+
+def test_filter_requires_all_skills(index):
+    assert index.filter(['python', 'AWS']) == {'a'}
+    assert index.filter(['python']) == {'a', 'b'}
+
+def test_filter_unknown_skill_matches_nothing(index):
+    assert index.filter(['java']) == set()
+
+def test_filter_without_skills_returns_everything(index):
+    assert index.filter([]) == {'a', 'b', 'c'}
+
+def test_filter_limits_to_candidates(index):
+    assert index.filter(['python'], candidates={'b': {}, 'z': {}}) == {'b'}
+
+def test_skill_scores(index):
+    assert index.skill_scores(['python', 'aws']) == {'a': 1.0, 'b': 0.5, 'c': 0.0}
+    assert index.skill_scores(['python', 'aws'], ['b', 'missing']) == {'b': 0.5}
+
+def test_skill_scores_counts_skills_outside_vocabulary():
+    index = SkillIndex(SKILLS)
+    index.add('a', ['python'])
+    assert index.skill_scores(['python', 'rust']) == {'a': 0.5}
+    assert index.skill_scores([]) == {'a': 0.0}
+
+def test_remove_frees_row_for_reuse(index):
+    index.remove('a')
+    assert 'a' not in index
+    assert index.filter(['aws']) == set()
+    assert index.skill_scores(['aws']) == {'b': 0.0, 'c': 0.0}
+
+    index.add('d', ['aws'])
+    assert len(index.rows) == 3
+    assert index.skill_scores(['aws'], ['d']) == {'d': 1.0}
+
+def test_readd_replaces_skills(index):
+    index.add('a', ['docker'])
+    assert index.filter(['python']) == {'b'}
+    assert index.skill_scores(['docker'], ['a']) == {'a': 1.0}
+
+def test_matrix_grows_in_chunks():
+    index = SkillIndex(SKILLS, chunk_size=2)
+    for i in range(5):
+        index.add(str(i), ['python'])
+    assert len(index.matrix) == 6
+    assert set(index.skill_scores(['python']).values()) == {1.0}
+
+def test_unknown_skills(index):
+    assert index.unknown(['Python', 'pyhton', 'rust']) == ['pyhton', 'rust']
+    assert index.unknown([]) == []
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+from utils.vector_store import QuantizedVectorStore
+
+DIM = 16
+
+@pytest.fixture(params=['int8', 'float16'])
+def store(request):
+    return QuantizedVectorStore(DIM, request.param, capacity=2, chunk_size=3)
+
+def unit(seed):
+    vector = np.random.default_rng(seed).standard_normal(DIM).astype(np.float32)
+    return vector / np.linalg.norm(vector)
+
+def test_rejects_unknown_dtype():
+    with pytest.raises(ValueError):
+        QuantizedVectorStore(DIM, 'int4')
+
+def test_scores_approximate_cosine(store):
+    vectors = {str(i): unit(i) for i in range(10)}
+    for vector_id, vector in vectors.items():
+        store.add(vector_id, vector * 3)  # Stored normalized regardless of input scale
+    query = unit(100)
+    scores = store.scores(query * 5)
+    assert set(scores) == set(vectors)
+    for vector_id, vector in vectors.items():
+        assert scores[vector_id] == pytest.approx(float(vector @ query), abs=0.02)
+
+def test_scores_skip_unknown_ids(store):
+    store.add('a', unit(1))
+    assert list(store.scores(unit(2), ['a', 'missing'])) == ['a']
+
+def test_search_returns_nearest(store):
+    for i in range(6):
+        store.add(str(i), unit(i))
+    assert store.search(unit(4), limit=1)[0][0] == '4'
+    assert len(store.search(unit(4), limit=3)) == 3
+
+def test_get_dequantizes(store):
+    store.add('a', unit(1) * 2)
+    assert np.allclose(store.get('a'), unit(1), atol=0.02)
+    with pytest.raises(KeyError):
+        store.get('missing')
+
+def test_add_replaces_in_place(store):
+    store.add('a', unit(1))
+    store.add('a', unit(2))
+    assert len(store) == 1
+    assert np.allclose(store.get('a'), unit(2), atol=0.02)
+
+def test_remove_moves_last_row_into_slot(store):
+    for vector_id in 'abc':
+        store.add(vector_id, unit(ord(vector_id)))
+    store.remove('a')
+    store.remove('missing')
+    assert 'a' not in store and len(store) == 2
+    assert store.rows['c'] == 0 and store.ids == ['c', 'b']
+    assert np.allclose(store.get('c'), unit(ord('c')), atol=0.02)
+    assert np.allclose(store.get('b'), unit(ord('b')), atol=0.02)
+
+def test_grows_past_capacity(store):
+    for i in range(9):
+        store.add(str(i), unit(i))
+    assert len(store.codes) >= 9
+    assert all(np.allclose(store.get(str(i)), unit(i), atol=0.02) for i in range(9))
+
+def test_nbytes(store):
+    store.add('a', unit(1))
+    expected = DIM + 4 if store.dtype == 'int8' else DIM * 2
+    assert store.nbytes == expected
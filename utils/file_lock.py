@@ -0,0 +1,28 @@
+import os
+
+# fcntl is POSIX-only; without it (local Windows dev) every process acts as the owner
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+def try_lock(path):
+    """Take an exclusive non-blocking lock on path; returns the open fd or None if held elsewhere"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    if fcntl is None:
+        return fd
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return fd
+    except OSError:
+        os.close(fd)
+        return None
+
+def release(fd):
+    """Release a lock taken with try_lock"""
+    if fd is None:
+        return
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    os.close(fd)
@@ -0,0 +1,304 @@
+import os
+import json
+import time
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from botocore.exceptions import ClientError
+from utils.resume_parser import COMMON_SKILLS, SKILLS_VERSION
+from utils.nlp_processor import extract_skills
+from utils.matching import model, MODEL_VERSION
+from utils.serialization import dumps, loads
+from utils.file_lock import try_lock, release
+
+logger = logging.getLogger(__name__)
+
+class ReindexJob:
+    """Background job that brings stored resume/job records up to the current
+    skill-set and model versions, recomputing only the stale derived fields.
+
+    Progress is an append-only checkpoint log: a version header, one line of
+    done/updated keys per batch and a completion marker. An interrupted run
+    resumes where it stopped instead of starting over. Only the process
+    holding the checkpoint lock runs the job; the other workers tail the log
+    and reload the records it rewrote.
+    """
+
+    def __init__(self, s3_client, bucket, batch_size=32, workers=4,
+                 checkpoint_path='data/reindex_checkpoint.jsonl', on_update=None, poll_interval=10):
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.batch_size = batch_size
+        self.workers = workers
+        self.checkpoint_path = checkpoint_path
+        self.on_update = on_update
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._thread = None
+        self._lock_fd = None
+        self._watcher = None
+        self._log_inode = None
+        self._log_offset = 0
+        self.status = {'state': 'idle'}
+
+    def start(self):
+        """Start the job in a background thread; returns False if it is already
+        running here or in another process"""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return False
+            self._lock_fd = try_lock(f"{self.checkpoint_path}.lock")
+            if self._lock_fd is None:
+                return False
+            self.status = {
+                'state': 'running',
+                'skills_version': SKILLS_VERSION,
+                'model_version': MODEL_VERSION,
+                'total': 0,
+                'processed': 0,
+                'updated': 0,
+                'failed': 0,
+                'started_at': time.time()
+            }
+            self._thread = threading.Thread(target=self.run, daemon=True)
+            self._thread.start()
+            return True
+
+    def _list_keys(self):
+        keys = []
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        for prefix in ('resumes/', 'jobs/'):
+            for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
+                keys.extend(obj['Key'] for obj in page.get('Contents', [])
+                            if obj['Key'].endswith('.json'))
+        return keys
+
+    @staticmethod
+    def _read_entries(file):
+        """Parse complete log lines; returns (entries, bytes consumed)"""
+        entries, consumed = [], 0
+        for line in file:
+            if not line.endswith(b'\n'):
+                break  # Batch still being appended
+            consumed += len(line)
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                continue
+        return entries, consumed
+
+    def _load_checkpoint(self):
+        """Keys done by an unfinished run for the current versions, or None to start fresh"""
+        try:
+            with open(self.checkpoint_path, 'rb') as file:
+                entries, _ = self._read_entries(file)
+        except OSError:
+            return None
+        # A log written for other versions, or for a finished run, says nothing about this run
+        if (not entries or entries[0].get('skills_version') != SKILLS_VERSION
+                or entries[0].get('model_version') != MODEL_VERSION
+                or any(entry.get('complete') for entry in entries)):
+            return None
+        done = set()
+        for entry in entries[1:]:
+            done.update(entry.get('done', []))
+        return done
+
+    def _start_checkpoint(self):
+        """Replace the log with a fresh header for the current versions"""
+        os.makedirs(os.path.dirname(self.checkpoint_path) or '.', exist_ok=True)
+        temp_path = f"{self.checkpoint_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            file.write(json.dumps({'skills_version': SKILLS_VERSION, 'model_version': MODEL_VERSION}) + '\n')
+        os.replace(temp_path, self.checkpoint_path)
+
+    def _append_checkpoint(self, entry):
+        with open(self.checkpoint_path, 'a', encoding='utf-8') as file:
+            file.write(json.dumps(entry) + '\n')
+
+    def _get_record(self, key):
+        response = self.s3_client.get_object(Bucket=self.bucket, Key=key)
+        return loads(response['Body'].read()), response.get('ETag')
+
+    def _put_record(self, key, record, etag):
+        # Only overwrite the version that was read, so a record deleted or
+        # replaced since then is not written back
+        conditions = {'IfMatch': etag} if etag else {}
+        self.s3_client.put_object(Bucket=self.bucket, Key=key,
+                                  Body=dumps(record), **conditions)
+
+    def refresh_record(self, key, record):
+        """Recompute stale skills in place; returns True if the record changed"""
+        # Older records also stored clean_text, which is derivable from raw_text
+        compacted = bool(record.get('raw_text')) and record.pop('clean_text', None) is not None
+        if record.get('skills_version') == SKILLS_VERSION:
+            return compacted
+        if key.startswith('jobs/'):
+            source_text = record.get('description', '')
+        else:
+            # Prefer raw text so symbols like "c++" survive, without re-parsing the file
+            source_text = record.get('raw_text') or record.get('clean_text', '')
+        record['skills'] = extract_skills(source_text, COMMON_SKILLS)
+        record['skills_version'] = SKILLS_VERSION
+        return True
+
+    def _process_batch(self, pool, keys):
+        records, etags = {}, {}
+        for key, result in zip(keys, pool.map(self._safe_get, keys)):
+            if result is not None:
+                records[key], etags[key] = result
+
+        changed = set()
+        for key, record in records.items():
+            if self.refresh_record(key, record):
+                changed.add(key)
+
+        # Embeddings only when the encoder changed, encoded as one batch
+        stale = [key for key, record in records.items()
+                 if key.startswith('resumes/') and record.get('processed_text')
+                 and record.get('model_version') != MODEL_VERSION]
+        if stale:
+            encoded = model.encode([records[key]['processed_text'] for key in stale])
+            for key, embedding in zip(stale, encoded):
+                records[key]['embedding'] = embedding.tolist()
+                records[key]['model_version'] = MODEL_VERSION
+            changed.update(stale)
+
+        changed = sorted(changed)
+        saved = list(pool.map(self._safe_put, changed, [records[key] for key in changed],
+                              [etags[key] for key in changed]))
+        updated = [key for key, ok in zip(changed, saved) if ok]
+        done = {key for key in records if key not in changed}
+        # Records deleted or replaced meanwhile (None) are settled; failed puts are retried
+        done.update(key for key, ok in zip(changed, saved) if ok is not False)
+
+        # Other records stay as they are in S3, so keep serving that copy
+        if self.on_update:
+            for key in updated:
+                self.on_update(key, records[key])
+        return done, updated
+
+    def _safe_get(self, key):
+        try:
+            return self._get_record(key)
+        except Exception as e:
+            logger.error(f"Error loading {key} for re-index: {str(e)}")
+            return None
+
+    def _safe_put(self, key, record, etag):
+        """True if saved, None if the record was deleted or replaced meanwhile, False on error"""
+        try:
+            self._put_record(key, record, etag)
+            return True
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('PreconditionFailed', 'NoSuchKey', '412', '404'):
+                logger.info(f"Skipping {key}: deleted or replaced during re-index")
+                return None
+            logger.error(f"Error saving {key} during re-index: {str(e)}")
+            return False
+        except Exception as e:
+            logger.error(f"Error saving {key} during re-index: {str(e)}")
+            return False
+
+    def run(self):
+        """Re-index every stored record, skipping keys already checkpointed"""
+        try:
+            done = self._load_checkpoint()
+            if done is None:
+                done = set()
+                self._start_checkpoint()
+            keys = self._list_keys()
+            pending = [key for key in keys if key not in done]
+            self.status.update({'total': len(keys), 'processed': len(keys) - len(pending)})
+            logger.info(f"Re-index started: {len(pending)} of {len(keys)} records pending")
+
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                for start in range(0, len(pending), self.batch_size):
+                    batch = pending[start:start + self.batch_size]
+                    batch_done, updated = self._process_batch(pool, batch)
+                    done.update(batch_done)
+                    self._append_checkpoint({'done': sorted(batch_done), 'updated': updated})
+                    self.status['processed'] += len(batch)
+                    self.status['updated'] += len(updated)
+                    self.status['failed'] += len(batch) - len(batch_done)
+                    logger.info(f"Re-index progress: {self.status['processed']}/{self.status['total']}")
+
+            # Failed keys are retried by the next run, which resumes this log
+            if self.status['failed'] == 0:
+                self._append_checkpoint({'complete': True})
+            self.status['state'] = 'done'
+        except Exception as e:
+            logger.error(f"Re-index failed: {str(e)}")
+            self.status['state'] = 'failed'
+            self.status['error'] = str(e)
+        finally:
+            self.status['finished_at'] = time.time()
+            # This process already applied its own updates; don't replay them
+            self._seek_checkpoint_end()
+            with self._lock:
+                release(self._lock_fd)
+                self._lock_fd = None
+
+    def _seek_checkpoint_end(self):
+        try:
+            stat = os.stat(self.checkpoint_path)
+            self._log_inode, self._log_offset = stat.st_ino, stat.st_size
+        except OSError:
+            self._log_inode, self._log_offset = None, 0
+
+    def apply_remote_updates(self):
+        """Reload records rewritten by a re-index run in another process"""
+        if self._thread and self._thread.is_alive():
+            return 0
+        try:
+            stat = os.stat(self.checkpoint_path)
+        except OSError:
+            return 0
+        # A new run replaces the file, so read it again from the start
+        if stat.st_ino != self._log_inode or stat.st_size < self._log_offset:
+            self._log_inode, self._log_offset = stat.st_ino, 0
+        if stat.st_size == self._log_offset:
+            return 0
+
+        with open(self.checkpoint_path, 'rb') as file:
+            file.seek(self._log_offset)
+            entries, consumed = self._read_entries(file)
+        self._log_offset += consumed
+
+        keys = [key for entry in entries for key in entry.get('updated', [])]
+        for key in keys:
+            result = self._safe_get(key)
+            if result is not None and self.on_update:
+                self.on_update(key, result[0])
+        return len(keys)
+
+    def start_watcher(self):
+        """Poll the checkpoint log in the background for other processes' updates"""
+        if self._watcher:
+            return
+        # Records loaded at startup are already current; only follow what comes next
+        self._seek_checkpoint_end()
+
+        def watch():
+            while True:
+                time.sleep(self.poll_interval)
+                try:
+                    self.apply_remote_updates()
+                except Exception as e:
+                    logger.error(f"Error applying re-index updates: {str(e)}")
+
+        self._watcher = threading.Thread(target=watch, daemon=True)
+        self._watcher.start()
+
+if __name__ == '__main__':
+    import boto3
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    job = ReindexJob(
+        boto3.client('s3', region_name=os.getenv('AWS_REGION', 'us-east-1')),
+        os.getenv('S3_BUCKET', 'resuucketaw'),
+        batch_size=int(os.getenv('REINDEX_BATCH_SIZE', 32)),
+        workers=int(os.getenv('WORKERS', 4))
+    )
+    if not job.start():
+        raise SystemExit('Re-index already running in another process')
+    job._thread.join()
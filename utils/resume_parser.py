@@ -1,8 +1,9 @@
 import os
 import re
+import hashlib
 import PyPDF2
 import docx
-from utils.nlp_processor import clean_text, preprocess_text, extract_skills
+from utils.nlp_processor import preprocess_text, extract_skills
 
 # Common tech skills for extraction
 COMMON_SKILLS = [
@@ -22,6 +23,9 @@ COMMON_SKILLS = [
     "project management", "agile", "scrum", "customer service", "presentation"
 ]
 
+# Changes whenever COMMON_SKILLS is edited, so stale stored skills can be detected
+SKILLS_VERSION = hashlib.sha1("\n".join(sorted(COMMON_SKILLS)).encode('utf-8')).hexdigest()[:12]
+
 def extract_text_from_pdf(file_path):
     """Extract text content from PDF file"""
     text = ""
@@ -68,9 +72,8 @@ def parse_resume(file_path):
     else:
         return None
     
-    # Clean and preprocess text
+    # Preprocess text (clean_text is not stored; it is cheap to derive from raw_text)
     raw_text = text
-    clean_resume = clean_text(text)
     processed_resume = preprocess_text(text)
     
     # Extract skills
@@ -78,9 +81,9 @@ def parse_resume(file_path):
     
     resume_data = {
         'raw_text': raw_text,
-        'clean_text': clean_resume,
         'processed_text': processed_resume,
         'skills': skills,
+        'skills_version': SKILLS_VERSION,
         'file_type': file_extension[1:]  # Remove the dot
     }
     
@@ -0,0 +1,85 @@
+import time
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from utils.serialization import loads
+
+logger = logging.getLogger(__name__)
+
+class ResumeSync:
+    """Periodically reconciles a process's in-memory resumes with S3.
+
+    Each gunicorn worker keeps its own copy of the resume records and the
+    indexes built from them, so uploads and deletes handled by one worker are
+    invisible to the others. Every pass lists the resume metadata keys and
+    hands records missing locally to on_add and records gone from S3 to
+    on_remove.
+    """
+
+    def __init__(self, s3_client, bucket, local_ids, on_add, on_remove,
+                 interval=30, workers=8, prefix='resumes/'):
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.local_ids = local_ids
+        self.on_add = on_add
+        self.on_remove = on_remove
+        self.interval = interval
+        self.workers = workers
+        self.prefix = prefix
+        self._thread = None
+
+    def _list_ids(self):
+        ids = set()
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=self.prefix):
+            ids.update(obj['Key'][len(self.prefix):-len('.json')] for obj in page.get('Contents', [])
+                       if obj['Key'].endswith('.json'))
+        return ids
+
+    def _safe_get(self, resume_id):
+        try:
+            response = self.s3_client.get_object(Bucket=self.bucket, Key=f"{self.prefix}{resume_id}.json")
+            return loads(response['Body'].read())
+        except Exception as e:
+            # Usually deleted since the listing; the next pass settles it either way
+            logger.warning(f"Error loading resume {resume_id} during sync: {str(e)}")
+            return None
+
+    def sync_once(self):
+        """Run one reconciliation pass; returns (added, removed) counts"""
+        # Snapshot local ids before listing: anything uploaded here after the
+        # snapshot is absent from it, so a listing that misses it removes nothing
+        local = set(self.local_ids())
+        remote = self._list_ids()
+
+        removed = local - remote
+        for resume_id in removed:
+            self.on_remove(resume_id)
+
+        added = 0
+        missing = sorted(remote - local)
+        if missing:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                for resume_id, record in zip(missing, pool.map(self._safe_get, missing)):
+                    if record is not None:
+                        self.on_add(resume_id, record)
+                        added += 1
+        if added or removed:
+            logger.info(f"Resume sync: {added} added, {len(removed)} removed")
+        return added, len(removed)
+
+    def start(self):
+        """Reconcile in a background thread every interval seconds"""
+        if self._thread:
+            return
+
+        def loop():
+            while True:
+                time.sleep(self.interval)
+                try:
+                    self.sync_once()
+                except Exception as e:
+                    logger.error(f"Error syncing resumes from S3: {str(e)}")
+
+        self._thread = threading.Thread(target=loop, daemon=True)
+        self._thread.start()
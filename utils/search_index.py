@@ -0,0 +1,349 @@
+import os
+import json
+import math
+import shutil
+import zipfile
+import threading
+from collections import Counter
+import numpy as np
+from utils.file_lock import try_lock
+
+class _Postings:
+    """Growable parallel arrays of document slots and term frequencies for one term"""
+
+    __slots__ = ('slots', 'tfs', 'size')
+
+    def __init__(self, capacity=8):
+        self.slots = np.empty(capacity, dtype=np.int32)
+        self.tfs = np.empty(capacity, dtype=np.float32)
+        self.size = 0
+
+    def append(self, slot, tf):
+        if self.size == len(self.slots):
+            # Replace rather than resize in place so concurrent readers keep a valid view
+            capacity = max(8, 2 * self.size)
+            slots = np.empty(capacity, dtype=np.int32)
+            tfs = np.empty(capacity, dtype=np.float32)
+            slots[:self.size] = self.slots[:self.size]
+            tfs[:self.size] = self.tfs[:self.size]
+            self.slots, self.tfs = slots, tfs
+        self.slots[self.size] = slot
+        self.tfs[self.size] = tf
+        self.size += 1
+
+class BM25Index:
+    """Incrementally maintained BM25 inverted index over preprocessed resume text.
+
+    Postings are numpy arrays of document slots and term frequencies, so a
+    query is scored with vector ops. Removed documents are tombstoned and
+    compacted away once they make up a quarter of the slots.
+
+    The index is persisted as an .npz snapshot of the concatenated postings
+    plus an append-only journal of adds/removes. Every compact_after journal
+    entries the journal is rotated and a snapshot is written from a background
+    thread, outside the index lock. Only the process holding the lock file
+    writes them; other processes load the files read-only and keep their own
+    updates in memory. S3 remains the source of truth and startup reconciles
+    against it.
+    """
+
+    def __init__(self, path=None, k1=1.5, b=0.75, compact_after=1000):
+        self.path = path
+        self.journal_path = f"{path}.journal" if path else None
+        self.prev_journal_path = f"{path}.journal.prev" if path else None
+        self.k1 = k1
+        self.b = b
+        self.compact_after = compact_after
+        self._journal_entries = 0
+        self._lock = threading.Lock()
+        self._snapshot_lock = threading.Lock()
+        self._snapshot_thread = None
+        self._writer_fd = try_lock(f"{path}.lock") if path else None
+        self._reset()
+
+    def _reset(self):
+        self.postings = {}
+        self.slot_of = {}
+        self.slot_ids = []
+        self.doc_lengths = np.zeros(1024, dtype=np.float32)
+        self.alive = np.zeros(1024, dtype=bool)
+        self.total_length = 0.0
+
+    @property
+    def is_writer(self):
+        """Whether this process owns the on-disk snapshot and journal"""
+        return self._writer_fd is not None
+
+    def __len__(self):
+        return len(self.slot_of)
+
+    def __contains__(self, doc_id):
+        return doc_id in self.slot_of
+
+    def _add(self, doc_id, term_counts):
+        self._remove(doc_id)
+        slot = len(self.slot_ids)
+        if slot == len(self.alive):
+            self.doc_lengths = np.concatenate([self.doc_lengths, np.zeros_like(self.doc_lengths)])
+            self.alive = np.concatenate([self.alive, np.zeros_like(self.alive)])
+        length = sum(term_counts.values())
+        self.slot_ids.append(doc_id)
+        self.slot_of[doc_id] = slot
+        self.doc_lengths[slot] = length
+        self.alive[slot] = True
+        self.total_length += length
+        for term, count in term_counts.items():
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self.postings[term] = _Postings()
+            postings.append(slot, count)
+
+    def _remove(self, doc_id):
+        slot = self.slot_of.pop(doc_id, None)
+        if slot is None:
+            return False
+        self.alive[slot] = False
+        self.slot_ids[slot] = None
+        self.total_length -= float(self.doc_lengths[slot])
+        dead = len(self.slot_ids) - len(self.slot_of)
+        if dead > 64 and dead * 4 > len(self.slot_ids):
+            self._compact()
+        return True
+
+    def _compact(self):
+        """Drop tombstoned slots, building new arrays so in-flight searches are unaffected"""
+        count = len(self.slot_ids)
+        live = np.flatnonzero(self.alive[:count])
+        remap = np.full(count, -1, dtype=np.int32)
+        remap[live] = np.arange(len(live), dtype=np.int32)
+
+        postings = {}
+        for term, old in self.postings.items():
+            slots = old.slots[:old.size]
+            keep = self.alive[slots]
+            if not keep.any():
+                continue
+            new = _Postings(0)
+            new.slots = remap[slots[keep]]
+            new.tfs = old.tfs[:old.size][keep]
+            new.size = len(new.slots)
+            postings[term] = new
+
+        capacity = max(1024, len(live))
+        doc_lengths = np.zeros(capacity, dtype=np.float32)
+        doc_lengths[:len(live)] = self.doc_lengths[live]
+        alive = np.zeros(capacity, dtype=bool)
+        alive[:len(live)] = True
+        self.slot_ids = [self.slot_ids[slot] for slot in live]
+        self.slot_of = {doc_id: slot for slot, doc_id in enumerate(self.slot_ids)}
+        self.postings, self.doc_lengths, self.alive = postings, doc_lengths, alive
+
+    def add(self, doc_id, processed_text):
+        """Index (or re-index) a document from its preprocessed text"""
+        term_counts = dict(Counter(processed_text.split()))
+        with self._lock:
+            self._add(doc_id, term_counts)
+            self._append_journal({'op': 'add', 'id': doc_id, 'tf': term_counts})
+
+    def remove(self, doc_id):
+        """Drop a document from the index"""
+        with self._lock:
+            if self._remove(doc_id):
+                self._append_journal({'op': 'remove', 'id': doc_id})
+
+    def search(self, query_terms, limit=10, candidates=None):
+        """Return the top (doc_id, score) pairs for the query terms"""
+        # Take consistent references under the lock, then score without holding it
+        with self._lock:
+            num_docs = len(self.slot_of)
+            if num_docs == 0:
+                return []
+            avg_length = self.total_length / num_docs
+            slot_count = len(self.slot_ids)
+            slot_ids, slot_of = self.slot_ids, self.slot_of
+            doc_lengths, alive = self.doc_lengths[:slot_count], self.alive[:slot_count].copy()
+            term_postings = []
+            for term in set(query_terms):
+                postings = self.postings.get(term)
+                if postings is not None:
+                    term_postings.append((postings.slots[:postings.size], postings.tfs[:postings.size]))
+
+        scores = np.zeros(slot_count, dtype=np.float32)
+        for slots, tfs in term_postings:
+            live = alive[slots]
+            df = int(live.sum())
+            if df == 0:
+                continue
+            idf = math.log(1 + (num_docs - df + 0.5) / (df + 0.5))
+            norm = self.k1 * (1 - self.b + self.b * doc_lengths[slots] / avg_length)
+            scores[slots] += live * (idf * tfs * (self.k1 + 1) / (tfs + norm))
+
+        if candidates is not None:
+            mask = np.zeros(slot_count, dtype=bool)
+            mask[[slot_of[doc_id] for doc_id in candidates
+                  if doc_id in slot_of and slot_of[doc_id] < slot_count]] = True
+            scores[~mask] = 0
+
+        matched = np.flatnonzero(scores)
+        if len(matched) > limit:
+            matched = matched[np.argpartition(-scores[matched], limit - 1)[:limit]]
+        matched = matched[np.argsort(-scores[matched], kind='stable')]
+        return [(slot_ids[slot], float(scores[slot])) for slot in matched
+                if slot < len(slot_ids) and slot_ids[slot] is not None]
+
+    def _append_journal(self, entry):
+        if not self.journal_path or not self.is_writer:
+            return
+        try:
+            with open(self.journal_path, 'a', encoding='utf-8') as journal:
+                journal.write(json.dumps(entry) + '\n')
+            self._journal_entries += 1
+            # Skip if a snapshot is still being written; the journal just grows until it is done
+            if self._journal_entries >= self.compact_after and self._snapshot_lock.acquire(blocking=False):
+                try:
+                    captured = self._capture()
+                except OSError:
+                    self._snapshot_lock.release()
+                    raise
+                self._snapshot_thread = threading.Thread(target=self._write_snapshot, args=(captured,),
+                                                         daemon=True)
+                self._snapshot_thread.start()
+        except OSError as e:
+            print(f"Error writing search index journal: {e}")
+
+    def _capture(self):
+        """Take what a snapshot needs and rotate the journal (caller holds the index lock).
+
+        Postings are only appended past their current size or replaced, so
+        views sliced to size stay valid; arrays mutated in place are copied.
+        """
+        count = len(self.slot_ids)
+        captured = (list(self.slot_ids), self.doc_lengths[:count].copy(), self.alive[:count].copy(),
+                    [(term, postings.slots[:postings.size], postings.tfs[:postings.size])
+                     for term, postings in self.postings.items()])
+        if os.path.exists(self.journal_path):
+            if os.path.exists(self.prev_journal_path):
+                # An earlier snapshot failed; its entries are still needed
+                with open(self.journal_path, 'rb') as src, open(self.prev_journal_path, 'ab') as dst:
+                    shutil.copyfileobj(src, dst)
+                os.unlink(self.journal_path)
+            else:
+                os.replace(self.journal_path, self.prev_journal_path)
+        self._journal_entries = 0
+        return captured
+
+    def _write_snapshot(self, captured):
+        """Serialize a captured index without holding the index lock"""
+        try:
+            slot_ids, doc_lengths, alive, postings = captured
+            live = np.flatnonzero(alive)
+            remap = np.full(len(slot_ids), -1, dtype=np.int32)
+            remap[live] = np.arange(len(live), dtype=np.int32)
+
+            terms, offsets, slots, tfs = [], [0], [], []
+            for term, term_slots, term_tfs in postings:
+                keep = alive[term_slots]
+                if not keep.any():
+                    continue
+                terms.append(term)
+                slots.append(remap[term_slots[keep]])
+                tfs.append(term_tfs[keep])
+                offsets.append(offsets[-1] + len(slots[-1]))
+
+            temp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(temp_path, 'wb') as file:
+                np.savez(file,
+                         doc_ids=np.array([slot_ids[slot] for slot in live], dtype=str),
+                         doc_lengths=doc_lengths[live],
+                         terms=np.array(terms, dtype=str),
+                         offsets=np.array(offsets, dtype=np.int64),
+                         slots=np.concatenate(slots) if slots else np.empty(0, dtype=np.int32),
+                         tfs=np.concatenate(tfs) if tfs else np.empty(0, dtype=np.float32))
+            os.replace(temp_path, self.path)
+            if os.path.exists(self.prev_journal_path):
+                os.unlink(self.prev_journal_path)
+        except OSError as e:
+            print(f"Error saving search index: {e}")
+        finally:
+            self._snapshot_lock.release()
+
+    def save(self):
+        """Write a full snapshot and truncate the journal (owner process only)"""
+        if not self.path or not self.is_writer:
+            return
+        self._snapshot_lock.acquire()
+        try:
+            with self._lock:
+                captured = self._capture()
+        except OSError as e:
+            self._snapshot_lock.release()
+            print(f"Error saving search index: {e}")
+            return
+        self._write_snapshot(captured)
+
+    def _load_snapshot(self, snapshot):
+        doc_ids = snapshot['doc_ids'].tolist()
+        capacity = max(1024, len(doc_ids))
+        self.slot_ids = doc_ids
+        self.slot_of = {doc_id: slot for slot, doc_id in enumerate(doc_ids)}
+        self.doc_lengths = np.zeros(capacity, dtype=np.float32)
+        self.doc_lengths[:len(doc_ids)] = snapshot['doc_lengths']
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.alive[:len(doc_ids)] = True
+        self.total_length = float(self.doc_lengths.sum())
+        self.postings = {}
+        offsets, slots, tfs = snapshot['offsets'], snapshot['slots'], snapshot['tfs']
+        for i, term in enumerate(snapshot['terms'].tolist()):
+            # Views into the concatenated arrays; a full view is replaced, never written, on append
+            postings = _Postings(0)
+            postings.slots = slots[offsets[i]:offsets[i + 1]]
+            postings.tfs = tfs[offsets[i]:offsets[i + 1]]
+            postings.size = len(postings.slots)
+            self.postings[term] = postings
+
+    def _replay(self, journal):
+        for line in journal:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # Torn write from an interrupted append
+            if entry['op'] == 'add':
+                self._add(entry['id'], entry['tf'])
+            elif entry['op'] == 'remove':
+                self._remove(entry['id'])
+
+    def load(self):
+        """Load the snapshot from disk and replay the rotated and current journals"""
+        if not self.path:
+            return
+        with self._lock:
+            try:
+                # Open the rotated journal before the snapshot: if the writer finishes a
+                # snapshot meanwhile, replaying entries it already contains is harmless
+                prev_journal = open(self.prev_journal_path, 'r', encoding='utf-8') \
+                    if os.path.exists(self.prev_journal_path) else None
+                try:
+                    if os.path.exists(self.path):
+                        with np.load(self.path, allow_pickle=False) as snapshot:
+                            self._load_snapshot(snapshot)
+                    if prev_journal is not None:
+                        self._replay(prev_journal)
+                finally:
+                    if prev_journal is not None:
+                        prev_journal.close()
+                if os.path.exists(self.journal_path):
+                    with open(self.journal_path, 'r', encoding='utf-8') as journal:
+                        self._replay(journal)
+            except (OSError, ValueError, KeyError, TypeError, zipfile.BadZipFile) as e:
+                print(f"Error loading search index, rebuilding: {e}")
+                self._reset()
+
+    def sync(self, documents):
+        """Bring the index in line with {doc_id: processed_text} and snapshot it"""
+        with self._lock:
+            for doc_id in set(self.slot_of) - set(documents):
+                self._remove(doc_id)
+            for doc_id, processed_text in documents.items():
+                if doc_id not in self.slot_of:
+                    self._add(doc_id, dict(Counter(processed_text.split())))
+        self.save()
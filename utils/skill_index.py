@@ -0,0 +1,114 @@
+import threading
+import numpy as np
+
+class SkillIndex:
+    """Inverted skill index plus a resume x skill matrix over a fixed vocabulary.
+
+    Each resume owns a stable row slot that is rewritten in place on add and
+    zeroed on remove; freed slots are reused and the matrix grows in chunks,
+    so updates never rebuild it. With a vocabulary of a few dozen skills the
+    0/1 matrix is kept dense as uint8 (one byte per skill per resume).
+    """
+
+    def __init__(self, skill_set, chunk_size=1024):
+        self.skills = [skill.lower() for skill in skill_set]
+        self.columns = {skill: col for col, skill in enumerate(self.skills)}
+        self.postings = {skill: set() for skill in self.skills}
+        self.resume_skills = {}
+        self.chunk_size = chunk_size
+        self.matrix = np.zeros((chunk_size, len(self.skills)), dtype=np.uint8)
+        self.rows = {}
+        self.row_ids = []
+        self.free_rows = []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.resume_skills)
+
+    def __contains__(self, resume_id):
+        return resume_id in self.resume_skills
+
+    def unknown(self, skills):
+        """Skills (lowercased) outside the indexed vocabulary"""
+        return sorted({skill.lower() for skill in skills} - self.columns.keys())
+
+    def add(self, resume_id, skills):
+        """Index (or re-index) a resume's skills"""
+        known = {skill.lower() for skill in skills if skill.lower() in self.columns}
+        with self._lock:
+            self._remove(resume_id)
+            self.resume_skills[resume_id] = known
+            for skill in known:
+                self.postings[skill].add(resume_id)
+
+            if self.free_rows:
+                row = self.free_rows.pop()
+                self.row_ids[row] = resume_id
+            else:
+                row = len(self.row_ids)
+                self.row_ids.append(resume_id)
+                if row == len(self.matrix):
+                    grown = np.zeros((len(self.matrix) + self.chunk_size, len(self.skills)), dtype=np.uint8)
+                    grown[:len(self.matrix)] = self.matrix
+                    self.matrix = grown
+            self.rows[resume_id] = row
+            self.matrix[row] = 0
+            self.matrix[row, [self.columns[skill] for skill in known]] = 1
+
+    def remove(self, resume_id):
+        """Drop a resume from the index"""
+        with self._lock:
+            self._remove(resume_id)
+
+    def _remove(self, resume_id):
+        skills = self.resume_skills.pop(resume_id, None)
+        if skills is None:
+            return False
+        for skill in skills:
+            self.postings[skill].discard(resume_id)
+        row = self.rows.pop(resume_id)
+        self.row_ids[row] = None
+        self.matrix[row] = 0
+        self.free_rows.append(row)
+        return True
+
+    def filter(self, required_skills, candidates=None):
+        """Return ids of resumes having ALL required skills, optionally limited to candidates"""
+        required = {skill.lower() for skill in required_skills}
+        with self._lock:
+            if not required:
+                result = set(self.resume_skills)
+            elif any(skill not in self.postings for skill in required):
+                return set()
+            else:
+                # Intersect smallest posting lists first
+                lists = sorted((self.postings[skill] for skill in required), key=len)
+                result = set(lists[0])
+                for posting in lists[1:]:
+                    result &= posting
+                    if not result:
+                        break
+        if candidates is not None:
+            result = {resume_id for resume_id in result if resume_id in candidates}
+        return result
+
+    def skill_scores(self, job_skills, resume_ids=None):
+        """Fraction of job skills present in each resume, as {resume_id: score}"""
+        job_skills = {skill.lower() for skill in job_skills}
+        columns = [self.columns[skill] for skill in job_skills if skill in self.columns]
+        with self._lock:
+            if resume_ids is None:
+                # Score every slot; free slots are zeroed and dropped below
+                resume_ids = list(self.row_ids)
+                matrix = self.matrix[:len(resume_ids)]
+            else:
+                resume_ids = [resume_id for resume_id in resume_ids if resume_id in self.rows]
+                rows = np.fromiter((self.rows[resume_id] for resume_id in resume_ids),
+                                   dtype=np.int64, count=len(resume_ids))
+                matrix = self.matrix[rows]
+            # Selecting only the job's columns is the mat-vec with a 0/1 job vector
+            counts = matrix[:, columns].sum(axis=1) if columns else np.zeros(len(resume_ids))
+
+        scores = counts / len(job_skills) if job_skills else counts
+        return {resume_id: score for resume_id, score in zip(resume_ids, scores.tolist())
+                if resume_id is not None}
@@ -0,0 +1,120 @@
+import heapq
+import threading
+import numpy as np
+
+def quantize(vectors, dtype):
+    """Quantize L2-normalized float32 rows to float16, or int8 with one scale per row"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if dtype == 'float16':
+        return vectors.astype(np.float16), None
+    scales = np.abs(vectors).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    codes = np.round(vectors / scales[:, None]).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+class QuantizedVectorStore:
+    """Compact in-memory store of normalized embeddings scored without dequantizing
+
+    Vectors are kept as float16, or int8 with a per-vector scale, so the dot
+    product with a normalized query approximates cosine similarity.
+    """
+
+    def __init__(self, dim, dtype='int8', capacity=1024, chunk_size=8192):
+        if dtype not in ('int8', 'float16'):
+            raise ValueError(f"Unsupported vector dtype: {dtype}")
+        self.dim = dim
+        self.dtype = dtype
+        self.chunk_size = chunk_size
+        self.codes = np.zeros((capacity, dim), dtype=np.int8 if dtype == 'int8' else np.float16)
+        self.scales = np.ones(capacity, dtype=np.float32)
+        self.ids = []
+        self.rows = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, vector_id):
+        return vector_id in self.rows
+
+    @property
+    def nbytes(self):
+        """Bytes used by the stored vectors (excluding spare capacity)"""
+        per_vector = self.codes.itemsize * self.dim + (self.scales.itemsize if self.dtype == 'int8' else 0)
+        return per_vector * len(self.ids)
+
+    def add(self, vector_id, vector):
+        """Insert or replace a vector"""
+        vector = np.asarray(vector, dtype=np.float32).reshape(1, -1)
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector = vector / norm
+        codes, scales = quantize(vector, self.dtype)
+        with self._lock:
+            row = self.rows.get(vector_id)
+            if row is None:
+                row = len(self.ids)
+                if row == len(self.codes):
+                    self._grow()
+                self.ids.append(vector_id)
+                self.rows[vector_id] = row
+            self.codes[row] = codes[0]
+            if scales is not None:
+                self.scales[row] = scales[0]
+
+    def _grow(self):
+        capacity = max(1, len(self.codes)) * 2
+        codes = np.zeros((capacity, self.dim), dtype=self.codes.dtype)
+        codes[:len(self.codes)] = self.codes
+        scales = np.ones(capacity, dtype=np.float32)
+        scales[:len(self.scales)] = self.scales
+        self.codes, self.scales = codes, scales
+
+    def remove(self, vector_id):
+        """Delete a vector, moving the last row into its slot"""
+        with self._lock:
+            row = self.rows.pop(vector_id, None)
+            if row is None:
+                return
+            last = len(self.ids) - 1
+            if row != last:
+                moved_id = self.ids[last]
+                self.codes[row] = self.codes[last]
+                self.scales[row] = self.scales[last]
+                self.ids[row] = moved_id
+                self.rows[moved_id] = row
+            self.ids.pop()
+
+    def get(self, vector_id):
+        """Return the dequantized (normalized) vector"""
+        with self._lock:
+            row = self.rows[vector_id]
+            return self.codes[row].astype(np.float32) * self.scales[row]
+
+    def scores(self, query, ids=None):
+        """Approximate cosine similarity of the query to stored vectors, as {id: score}"""
+        query = np.asarray(query, dtype=np.float32).ravel()
+        norm = np.linalg.norm(query)
+        if norm > 0:
+            query = query / norm
+
+        with self._lock:
+            if ids is None:
+                rows = np.arange(len(self.ids))
+            else:
+                rows = np.array([self.rows[vector_id] for vector_id in ids if vector_id in self.rows],
+                                dtype=np.int64)
+            row_ids = [self.ids[row] for row in rows]
+            results = np.empty(len(rows), dtype=np.float32)
+            # Upcast in chunks so scoring never materializes a full float32 copy
+            for start in range(0, len(rows), self.chunk_size):
+                chunk = rows[start:start + self.chunk_size]
+                results[start:start + len(chunk)] = self.codes[chunk].astype(np.float32) @ query
+                if self.dtype == 'int8':
+                    results[start:start + len(chunk)] *= self.scales[chunk]
+
+        return dict(zip(row_ids, results.tolist()))
+
+    def search(self, query, limit=10, ids=None):
+        """Return the top (id, approximate score) pairs"""
+        return heapq.nlargest(limit, self.scores(query, ids).items(), key=lambda item: item[1])